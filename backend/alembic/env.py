@@ -3,8 +3,8 @@ from logging.config import fileConfig
 from sqlalchemy import create_engine, pool
 from alembic import context
 from dotenv import load_dotenv
-from backend.app.models.add_climb import User  # Ensure all relevant models are imported
-from backend.app.db.base import Base  # Make sure Base is imported
+from app.models.add_climb import User  # Ensure all relevant models are imported
+from app.db.base import Base  # Make sure Base is imported
 
 # Load environment variables from .env file
 load_dotenv()
@@ -0,0 +1,26 @@
+"""add climb coordinate index
+
+Revision ID: 3f1c9a2d7b10
+Revises: 
+Create Date: 2026-10-18 12:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_climbs_longitude_latitude', 'climbs', ['longitude', 'latitude'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_climbs_longitude_latitude', table_name='climbs', if_exists=True)
@@ -0,0 +1,59 @@
+"""add climb geom and spatial indexes
+
+Revision ID: 8d2e4b6c1a37
+Revises: 3f1c9a2d7b10
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6c1a37'
+down_revision: Union[str, None] = '3f1c9a2d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    # A stored generated column is filled for every existing row when it is added
+    op.execute(
+        """
+        ALTER TABLE climbs
+        ADD COLUMN IF NOT EXISTS geom geometry(Point, 4326)
+        GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_climbs_geom ON climbs USING gist (geom)")
+
+    # Areas were stored without an SRID; pin them to 4326 so they compare with climbs.geom.
+    # A column create_all made is already geometry(MultiPolygon, 4326) and may hold
+    # multipolygons, so it is left for a7c9e1b3d504 as it is
+    srid = op.get_bind().scalar(sa.text(
+        """
+        SELECT srid FROM geometry_columns
+        WHERE f_table_schema = current_schema() AND f_table_name = 'areas' AND f_geometry_column = 'polygon'
+        """
+    ))
+    if srid != 4326:
+        op.execute(
+            """
+            ALTER TABLE areas
+            ALTER COLUMN polygon TYPE geometry(Polygon, 4326)
+            USING ST_SetSRID(polygon, 4326)
+            """
+        )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_areas_polygon ON areas USING gist (polygon)")
+    op.execute("ANALYZE climbs")
+    op.execute("ANALYZE areas")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE areas ALTER COLUMN polygon TYPE geometry(Polygon) USING ST_SetSRID(polygon, 0)")
+    op.execute("DROP INDEX IF EXISTS idx_climbs_geom")
+    op.execute("ALTER TABLE climbs DROP COLUMN IF EXISTS geom")
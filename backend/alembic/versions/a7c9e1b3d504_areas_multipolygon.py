@@ -0,0 +1,41 @@
+"""areas multipolygon
+
+Revision ID: a7c9e1b3d504
+Revises: f4a6c8e0b213
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d504'
+down_revision: Union[str, None] = 'f4a6c8e0b213'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing single polygons become one-part multipolygons; idx_areas_polygon is rebuilt in place
+    op.execute(
+        """
+        ALTER TABLE areas
+        ALTER COLUMN polygon TYPE geometry(MultiPolygon, 4326)
+        USING ST_Multi(polygon)
+        """
+    )
+    op.execute("ANALYZE areas")
+
+
+def downgrade() -> None:
+    # Only the first part of each area survives a downgrade
+    op.execute(
+        """
+        ALTER TABLE areas
+        ALTER COLUMN polygon TYPE geometry(Polygon, 4326)
+        USING ST_GeometryN(polygon, 1)
+        """
+    )
@@ -0,0 +1,166 @@
+"""add activity feed
+
+Revision ID: b2d4f6a8c015
+Revises: a7c9e1b3d504
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from datetime import datetime, timezone
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c015'
+down_revision: Union[str, None] = 'a7c9e1b3d504'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Grade mapping as this revision shipped it, frozen so later edits to
+# app.grades leave what it writes unchanged
+FRENCH_LETTER_STEPS = {"a": 0, "b": 2, "c": 4}
+
+V_SCALE_VALUES = {
+    "V0-": 34, "V0": 36, "V0+": 37, "V1": 38, "V2": 40, "V3": 41, "V4": 42,
+    "V5": 44, "V6": 45, "V7": 46, "V8": 48, "V9": 50, "V10": 51, "V11": 52,
+    "V12": 53, "V13": 54, "V14": 55, "V15": 56, "V16": 57, "V17": 58,
+}
+
+_V_SCALE = re.compile(r"^V(\d{1,2})([+-]?)$", re.IGNORECASE)
+_FRENCH = re.compile(r"^([1-9])([abc])?(\+?)$")
+
+
+def _french_value(grade: str) -> Optional[float]:
+    match = _FRENCH.match(grade)
+    if not match:
+        return None
+    number, letter, plus = match.groups()
+    if letter:
+        return int(number) * 6 + FRENCH_LETTER_STEPS[letter] + (1 if plus else 0)
+    # A bare number ("4", "5+") spans its a-c range
+    return int(number) * 6 + (3 if plus else 0)
+
+
+def _v_scale_value(grade: str) -> Optional[float]:
+    match = _V_SCALE.match(grade)
+    if not match:
+        return None
+    key = f"V{int(match.group(1))}{match.group(2)}"
+    if key in V_SCALE_VALUES:
+        return V_SCALE_VALUES[key]
+    base = V_SCALE_VALUES.get(f"V{int(match.group(1))}")
+    if base is None:
+        return None
+    return base + (0.5 if match.group(2) == "+" else -0.5)
+
+
+def _single_value(grade: str) -> Optional[float]:
+    grade = grade.strip()
+    if not grade:
+        return None
+    if grade[0] in "vV":
+        return _v_scale_value(grade)
+    return _french_value(grade.lower())
+
+
+def grade_value(grade: Optional[str]) -> Optional[float]:
+    """Map a grade string to its numeric difficulty, or None if it isn't recognised.
+
+    Split grades such as "7a/7a+" or "V4/V5" take the mean of their parts.
+    """
+    if not grade:
+        return None
+    values = [_single_value(part) for part in grade.split("/")]
+    if not values or any(value is None for value in values):
+        return None
+    return sum(values) / len(values)
+
+
+def _occurred_at(value, fallback):
+    try:
+        parsed = datetime.fromisoformat(str(value).strip())
+    except (TypeError, ValueError):
+        return fallback
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    feed = op.create_table(
+        'activity_feed',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('log_id', sa.Integer(), sa.ForeignKey('logs.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('climb_id', sa.Integer(), sa.ForeignKey('climbs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('climb_name', sa.String(), nullable=True),
+        sa.Column('climb_type', sa.String(), nullable=True),
+        sa.Column('grade', sa.String(), nullable=True),
+        sa.Column('grade_value', sa.Float(), nullable=True),
+        sa.Column('comment', sa.String(length=100), nullable=True),
+        sa.Column('date', sa.String(), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('log_id'),
+        # main.py's create_all may already have made it if the app started first
+        if_not_exists=True,
+    )
+
+    # Rows for existing logs and first ascents; grades are normalized in Python
+    # so the values match what the app writes from now on. Entries the app
+    # already recorded are skipped, so the backfill can run over a live table.
+    bind = op.get_bind()
+    now = datetime.now(timezone.utc)
+    ticks = bind.execute(sa.text(
+        """
+        SELECT logs.id AS log_id, logs.climb_id, logs.user_id, users.username,
+               climbs.name AS climb_name, climbs.type AS climb_type,
+               logs.grade, logs.comment, logs.date
+        FROM logs
+        JOIN users ON users.id = logs.user_id
+        JOIN climbs ON climbs.id = logs.climb_id
+        WHERE NOT EXISTS (SELECT 1 FROM activity_feed WHERE activity_feed.log_id = logs.id)
+        """
+    )).mappings().all()
+    first_ascents = bind.execute(sa.text(
+        """
+        SELECT climbs.id AS climb_id, users.id AS user_id, climbs.first_ascensionist AS username,
+               climbs.name AS climb_name, climbs.type AS climb_type,
+               climbs.grade, climbs.first_ascent_date AS date
+        FROM climbs
+        LEFT JOIN users ON users.username = climbs.first_ascensionist
+        WHERE climbs.first_ascensionist IS NOT NULL AND climbs.first_ascensionist <> ''
+          AND NOT EXISTS (
+              SELECT 1 FROM activity_feed
+              WHERE activity_feed.kind = 'first_ascent' AND activity_feed.climb_id = climbs.id
+          )
+        """
+    )).mappings().all()
+
+    rows = [
+        dict(row, kind='tick', grade_value=grade_value(row['grade']), occurred_at=_occurred_at(row['date'], now))
+        for row in ticks
+    ] + [
+        dict(row, kind='first_ascent', comment=None, log_id=None,
+             grade_value=grade_value(row['grade']), occurred_at=_occurred_at(row['date'], now))
+        for row in first_ascents
+    ]
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        op.bulk_insert(feed, rows[start:start + BACKFILL_BATCH_SIZE])
+
+    op.execute("CREATE INDEX IF NOT EXISTS ix_activity_feed_kind_occurred_at ON activity_feed (kind, occurred_at DESC, id DESC)")
+    # 50 is app.grades.BIG_TICK_VALUE, the V9 / 8b cut-off of the old ILIKE filter
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_activity_feed_big_ticks ON activity_feed (occurred_at DESC, id DESC) "
+        "WHERE kind = 'tick' AND grade_value >= 50"
+    )
+    op.execute("ANALYZE activity_feed")
+
+
+def downgrade() -> None:
+    op.drop_table('activity_feed')
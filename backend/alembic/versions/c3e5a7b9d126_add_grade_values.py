@@ -0,0 +1,180 @@
+"""add grade values
+
+Revision ID: c3e5a7b9d126
+Revises: b2d4f6a8c015
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d126'
+down_revision: Union[str, None] = 'b2d4f6a8c015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Copy of app.grades as of this revision; the backfill must keep writing
+# the same values whatever the app's grade tables become
+FRENCH_LETTER_STEPS = {"a": 0, "b": 2, "c": 4}
+
+V_SCALE_VALUES = {
+    "V0-": 34, "V0": 36, "V0+": 37, "V1": 38, "V2": 40, "V3": 41, "V4": 42,
+    "V5": 44, "V6": 45, "V7": 46, "V8": 48, "V9": 50, "V10": 51, "V11": 52,
+    "V12": 53, "V13": 54, "V14": 55, "V15": 56, "V16": 57, "V17": 58,
+}
+
+FONT_VALUES = {
+    "3": 32, "4": 34, "4+": 35, "5": 36, "5+": 38,
+    "6A": 40, "6A+": 41, "6B": 41.5, "6B+": 42, "6C": 43, "6C+": 44,
+    "7A": 45, "7A+": 46, "7B": 47, "7B+": 48, "7C": 50, "7C+": 51,
+    "8A": 52, "8A+": 53, "8B": 54, "8B+": 55, "8C": 56, "8C+": 57, "9A": 58,
+}
+
+YDS_VALUES = {
+    "5.5": 26, "5.6": 28, "5.7": 30, "5.8": 32, "5.9": 34,
+    "5.10a": 36, "5.10b": 37, "5.10c": 38, "5.10d": 39,
+    "5.11a": 39.5, "5.11b": 40, "5.11c": 41, "5.11d": 42,
+    "5.12a": 43, "5.12b": 44, "5.12c": 45, "5.12d": 46,
+    "5.13a": 47, "5.13b": 48, "5.13c": 49, "5.13d": 50,
+    "5.14a": 51, "5.14b": 52, "5.14c": 53, "5.14d": 54,
+    "5.15a": 55, "5.15b": 56, "5.15c": 57, "5.15d": 58,
+}
+
+BOULDER_TYPES = {"boulder", "bouldering"}
+
+_V_SCALE = re.compile(r"^V(\d{1,2})([+-]?)$", re.IGNORECASE)
+_LETTER_GRADE = re.compile(r"^([1-9])([abcABC])?(\+?)$")
+_FONT_PREFIX = re.compile(r"^(?:font\s*|f)(?=\d)", re.IGNORECASE)
+_YDS = re.compile(r"^5\.(\d{1,2})([abcd]?)([+-]?)$", re.IGNORECASE)
+
+
+def _french_value(number: str, letter: Optional[str], plus: str) -> float:
+    if letter:
+        return int(number) * 6 + FRENCH_LETTER_STEPS[letter.lower()] + (1 if plus else 0)
+    # A bare number ("4", "5+") spans its a-c range
+    return int(number) * 6 + (3 if plus else 0)
+
+
+def _v_scale_value(grade: str) -> Optional[float]:
+    match = _V_SCALE.match(grade)
+    if not match:
+        return None
+    key = f"V{int(match.group(1))}{match.group(2)}"
+    if key in V_SCALE_VALUES:
+        return V_SCALE_VALUES[key]
+    base = V_SCALE_VALUES.get(f"V{int(match.group(1))}")
+    if base is None:
+        return None
+    return base + (0.5 if match.group(2) == "+" else -0.5)
+
+
+def _yds_value(grade: str) -> Optional[float]:
+    match = _YDS.match(grade)
+    if not match:
+        return None
+    number, letter, sign = match.groups()
+    letter = letter.lower()
+    if int(number) < 10:
+        value = YDS_VALUES.get(f"5.{int(number)}")
+        if value is None:
+            return None
+        return value + {"+": 0.5, "-": -0.5}.get(sign, 0)
+    if letter:
+        return YDS_VALUES.get(f"5.{int(number)}{letter}")
+    # 5.11 spans a-d; 5.11- and 5.11+ are its lower and upper halves
+    letters = {"-": "ab", "+": "cd"}.get(sign, "abcd")
+    values = [YDS_VALUES.get(f"5.{int(number)}{letter}") for letter in letters]
+    if any(value is None for value in values):
+        return None
+    return sum(values) / len(values)
+
+
+def _letter_grade_value(grade: str, font: bool) -> Optional[float]:
+    match = _LETTER_GRADE.match(grade)
+    if not match:
+        return None
+    number, letter, plus = match.groups()
+    if font:
+        return FONT_VALUES.get(f"{number}{(letter or '').upper()}{plus}")
+    return _french_value(number, letter, plus)
+
+
+def _single_value(grade: str, climb_type: Optional[str]) -> Optional[float]:
+    grade = grade.strip()
+    if not grade:
+        return None
+    if grade[0] in "vV":
+        return _v_scale_value(grade)
+    if grade.startswith("5."):
+        return _yds_value(grade)
+
+    prefixed = _FONT_PREFIX.match(grade)
+    if prefixed:
+        return _letter_grade_value(grade[prefixed.end():], font=True)
+    # "7A" and "7a" look alike: the climb type settles it when known, and
+    # otherwise the usual spelling does (Font upper case, French lower case)
+    if climb_type:
+        font = climb_type.strip().lower() in BOULDER_TYPES
+    else:
+        font = any(c in "ABC" for c in grade)
+    return _letter_grade_value(grade, font)
+
+
+def grade_value(grade: Optional[str], climb_type: Optional[str] = None) -> Optional[float]:
+    """Map a grade string to its numeric difficulty, or None if it isn't recognised.
+
+    Handles V-scale, Fontainebleau, French sport and YDS grades. Split grades
+    such as "7a/7a+" or "V4/V5" take the mean of their parts.
+    """
+    if not grade:
+        return None
+    values = [_single_value(part, climb_type) for part in grade.split("/")]
+    if not values or any(value is None for value in values):
+        return None
+    return sum(values) / len(values)
+
+
+def _backfill(table, type_column=None, where="TRUE"):
+    """Recompute grade_value for the rows of ``table`` from their grade string."""
+    bind = op.get_bind()
+    columns = "id, grade" + (f", {type_column}" if type_column else "")
+    rows = bind.execute(sa.text(f"SELECT {columns} FROM {table} WHERE grade IS NOT NULL AND {where}")).all()
+    updates = [
+        {"row_id": row[0], "value": grade_value(row[1], row[2] if type_column else None)}
+        for row in rows
+    ]
+    statement = sa.text(f"UPDATE {table} SET grade_value = :value WHERE id = :row_id")
+    for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+        bind.execute(statement, updates[start:start + BACKFILL_BATCH_SIZE])
+
+
+def upgrade() -> None:
+    op.add_column('climbs', sa.Column('grade_value', sa.Float(), nullable=True), if_not_exists=True)
+    op.add_column('logs', sa.Column('grade_value', sa.Float(), nullable=True), if_not_exists=True)
+
+    # Recomputed from the grade strings, so re-running over filled columns is harmless
+    _backfill('climbs', 'type')
+    _backfill('logs')
+    # Feed rows were normalized before Font and YDS grades were recognised;
+    # ticks follow their log and first ascents follow their climb
+    _backfill('activity_feed', where="kind = 'tick'")
+    _backfill('activity_feed', 'climb_type', where="kind = 'first_ascent'")
+
+    op.create_index('ix_climbs_grade_value_id', 'climbs', ['grade_value', 'id'], if_not_exists=True)
+    op.create_index('ix_logs_grade_value', 'logs', ['grade_value'], if_not_exists=True)
+    op.execute("ANALYZE climbs")
+    op.execute("ANALYZE logs")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_logs_grade_value', table_name='logs', if_exists=True)
+    op.drop_index('ix_climbs_grade_value_id', table_name='climbs', if_exists=True)
+    op.drop_column('logs', 'grade_value')
+    op.drop_column('climbs', 'grade_value')
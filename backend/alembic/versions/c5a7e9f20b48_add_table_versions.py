@@ -0,0 +1,33 @@
+"""add table versions
+
+Revision ID: c5a7e9f20b48
+Revises: 8d2e4b6c1a37
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e9f20b48'
+down_revision: Union[str, None] = '8d2e4b6c1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
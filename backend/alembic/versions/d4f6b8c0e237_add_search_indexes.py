@@ -0,0 +1,47 @@
+"""add search indexes
+
+Revision ID: d4f6b8c0e237
+Revises: c3e5a7b9d126
+Create Date: 2026-10-18 21:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e237'
+down_revision: Union[str, None] = 'c3e5a7b9d126'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Must match models.add_climb.CLIMB_SEARCH_DOCUMENT
+    op.execute(
+        """
+        ALTER TABLE climbs
+        ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', replace(coalesce(tags, ''), ',', ' ')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_climbs_search_vector ON climbs USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_climbs_name_trgm ON climbs USING gin (name gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_username_trgm ON users USING gin (username gin_trgm_ops)")
+    op.execute("ANALYZE climbs")
+    op.execute("ANALYZE users")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_username_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_climbs_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_climbs_search_vector")
+    op.execute("ALTER TABLE climbs DROP COLUMN IF EXISTS search_vector")
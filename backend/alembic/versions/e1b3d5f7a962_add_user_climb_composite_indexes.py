@@ -0,0 +1,30 @@
+"""add user climb composite indexes
+
+Revision ID: e1b3d5f7a962
+Revises: c5a7e9f20b48
+Create Date: 2026-10-18 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b3d5f7a962'
+down_revision: Union[str, None] = 'c5a7e9f20b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_ticklist_user_id_climb_id', 'ticklist', ['user_id', 'climb_id'], if_not_exists=True)
+    op.create_index('ix_hitlist_user_id_climb_id', 'hitlist', ['user_id', 'climb_id'], if_not_exists=True)
+    op.create_index('ix_logs_user_id_climb_id', 'logs', ['user_id', 'climb_id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_logs_user_id_climb_id', table_name='logs', if_exists=True)
+    op.drop_index('ix_hitlist_user_id_climb_id', table_name='hitlist', if_exists=True)
+    op.drop_index('ix_ticklist_user_id_climb_id', table_name='ticklist', if_exists=True)
@@ -0,0 +1,39 @@
+"""add climb tag array
+
+Revision ID: e5a7c9d1f348
+Revises: d4f6b8c0e237
+Create Date: 2026-10-18 22:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f348'
+down_revision: Union[str, None] = 'd4f6b8c0e237'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Must match models.add_climb.CLIMB_TAG_ARRAY; the tags string stays the source
+    op.execute(
+        r"""
+        ALTER TABLE climbs
+        ADD COLUMN IF NOT EXISTS tag_array text[]
+        GENERATED ALWAYS AS (
+            CASE WHEN btrim(coalesce(tags, '')) = '' THEN '{}'::text[]
+            ELSE regexp_split_to_array(upper(btrim(tags)), '\s*,\s*') END
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_climbs_tag_array ON climbs USING gin (tag_array)")
+    op.execute("ANALYZE climbs")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_climbs_tag_array")
+    op.execute("ALTER TABLE climbs DROP COLUMN IF EXISTS tag_array")
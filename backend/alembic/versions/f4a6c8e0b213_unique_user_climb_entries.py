@@ -0,0 +1,42 @@
+"""unique user climb entries
+
+Revision ID: f4a6c8e0b213
+Revises: e1b3d5f7a962
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a6c8e0b213'
+down_revision: Union[str, None] = 'e1b3d5f7a962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('ticklist', 'hitlist', 'logs')
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # Keep the oldest row of any duplicate pair left by the old check-then-insert race
+        op.execute(
+            f"DELETE FROM {table} newer USING {table} older "
+            f"WHERE newer.user_id = older.user_id AND newer.climb_id = older.climb_id AND newer.id > older.id"
+        )
+        # The unique constraint's index serves the same lookups as the plain one
+        op.drop_index(f'ix_{table}_user_id_climb_id', table_name=table, if_exists=True)
+        # main.py's create_all already makes the constraint the models declare
+        name = f'uq_{table}_user_id_climb_id'
+        if name not in {constraint['name'] for constraint in inspector.get_unique_constraints(table)}:
+            op.create_unique_constraint(name, table, ['user_id', 'climb_id'])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_constraint(f'uq_{table}_user_id_climb_id', table, type_='unique')
+        op.create_index(f'ix_{table}_user_id_climb_id', table, ['user_id', 'climb_id'], if_not_exists=True)
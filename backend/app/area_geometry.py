@@ -0,0 +1,74 @@
+# ClimbTanzania/backend/app/area_geometry.py
+import gzip
+import json
+import threading
+from typing import Optional
+
+from sqlalchemy import func
+
+from app.models import add_climb as models
+
+# Simplification tolerance in degrees for each detail level (~10 m and ~100 m at the equator)
+DETAIL_TOLERANCES = {
+    "full": None,
+    "medium": 0.0001,
+    "coarse": 0.001,
+}
+GEOJSON_DECIMALS = 6
+
+
+def detail_for_zoom(zoom: Optional[int]) -> str:
+    if zoom is None or zoom >= 14:
+        return "full"
+    if zoom >= 10:
+        return "medium"
+    return "coarse"
+
+
+class AreaGeometryCache:
+    """Area polygons as GeoJSON FeatureCollections, rendered once per detail level.
+
+    Each payload is stored as JSON and gzip bytes together with the ETag of
+    the areas table it was built from, so it is regenerated only after
+    ``/upload_kml`` bumps the areas version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._payloads = {}
+
+    def _render(self, db, detail: str):
+        tolerance = DETAIL_TOLERANCES[detail]
+        geometry = models.Area.polygon
+        if tolerance is not None:
+            geometry = func.ST_SimplifyPreserveTopology(geometry, tolerance)
+
+        rows = (
+            db.query(models.Area.id, models.Area.name, func.ST_AsGeoJSON(geometry, GEOJSON_DECIMALS))
+            .filter(models.Area.polygon.isnot(None))
+            .order_by(models.Area.id)
+            .all()
+        )
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "id": area_id, "properties": {"name": name}, "geometry": json.loads(geojson)}
+                for area_id, name, geojson in rows
+            ],
+        }
+        raw = json.dumps(collection, separators=(",", ":")).encode()
+        return raw, gzip.compress(raw)
+
+    def payload(self, db, detail: str, etag: str):
+        """Return ``(json_bytes, gzip_bytes)`` for the detail level."""
+        cached = self._payloads.get(detail)
+        if cached is not None and cached[0] == etag:
+            return cached[1], cached[2]
+
+        raw, compressed = self._render(db, detail)
+        with self._lock:
+            self._payloads[detail] = (etag, raw, compressed)
+        return raw, compressed
+
+
+area_geometry_cache = AreaGeometryCache()
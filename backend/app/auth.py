@@ -3,32 +3,80 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.models.add_climb import User
-from app.schemas.add_climb import TokenData
+from app.schemas.add_climb import CurrentUser
 from app.db.base import get_db
+from collections import OrderedDict
 import os
+import threading
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key")
 ALGORITHM = "HS256"
 
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# Verified token -> (expires_at, CurrentUser), most recently used last
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def _cache_get(token: str):
+    with _user_cache_lock:
+        entry = _user_cache.get(token)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.time():
+            del _user_cache[token]
+            return None
+        _user_cache.move_to_end(token)
+        return user
+
+
+def _cache_set(token: str, user: CurrentUser, token_expires_at):
+    expires_at = time.time() + AUTH_CACHE_TTL_SECONDS
+    if token_expires_at is not None:
+        expires_at = min(expires_at, token_expires_at)
+    with _user_cache_lock:
+        _user_cache[token] = (expires_at, user)
+        _user_cache.move_to_end(token)
+        while len(_user_cache) > AUTH_CACHE_MAX_ENTRIES:
+            _user_cache.popitem(last=False)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # A token verified within the last AUTH_CACHE_TTL_SECONDS needs no decoding or query
+    cached = _cache_get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print("Decoded JWT Payload:", payload)  # Debugging line
         username: str = payload.get("sub")
+        user_id = payload.get("uid")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = db.query(User).filter(User.username == token_data.username).first()
-    if user is None:
+
+    # Tokens carry the user id, so the check is a primary key lookup; tokens
+    # issued before the claim existed fall back to the username index.
+    query = db.query(User.id, User.username)
+    if user_id is not None:
+        user = query.filter(User.id == user_id).first()
+    else:
+        user = query.filter(User.username == username).first()
+    if user is None or user.username != username:
         raise credentials_exception
-    return user
 
+    current_user = CurrentUser(id=user.id, username=user.username)
+    _cache_set(token, current_user, payload.get("exp"))
+    return current_user
@@ -0,0 +1,156 @@
+# ClimbTanzania/backend/app/cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # Redis is optional, the in-process backend needs nothing extra
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def params_digest(list_params=(), **params) -> str:
+    """Digest of query params with empty values dropped and comma lists sorted."""
+    normalized = {}
+    for name, value in params.items():
+        if value is None or value == "":
+            continue
+        if name in list_params:
+            value = sorted({item.strip() for item in value.split(",") if item.strip()})
+        normalized[name] = value
+    return hashlib.sha1(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+class MemoryBackend:
+    """Size-bounded LRU with a per-entry TTL, local to this process."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: int = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Shared backend for multi-worker deployments.
+
+    Any client exposing ``get``/``set``/``dbsize`` works,
+    so a local stand-in such as fakeredis can replace a real server.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: int = CACHE_TTL_SECONDS):
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(f"cache:entry:{key}")
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(f"cache:entry:{key}", json.dumps(value), ex=self.ttl)
+
+    def size(self):
+        return self.client.dbsize()
+
+
+class ResponseCache:
+    """Response cache for read-heavy endpoints.
+
+    Every key embeds a version of the tables the endpoint reads from, taken
+    from ``table_versions`` (usually the ETag of ``catalog_validators``).
+    A write from any worker or the CLI moves that version, so every
+    dependent key is orphaned at once and ages out of the backend without
+    having to be enumerated, and a cached body always matches its ETag.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits = {}
+        self._misses = {}
+
+    def make_key(self, endpoint: str, version: str, list_params=(), **params):
+        digest = params_digest(list_params, **params)
+        version = hashlib.sha1(version.encode()).hexdigest()[:16]
+        return f"{endpoint}:{version}:{digest}"
+
+    def get(self, key):
+        endpoint = key.split(":", 1)[0]
+        value = None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Cache read failed for {endpoint}: {e}")
+        with self._lock:
+            counters = self._hits if value is not None else self._misses
+            counters[endpoint] = counters.get(endpoint, 0) + 1
+        return value
+
+    def set(self, key, value):
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.error(f"Cache write failed for {key.split(':', 1)[0]}: {e}")
+
+    def stats(self):
+        with self._lock:
+            hits, misses = dict(self._hits), dict(self._misses)
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "hits": sum(hits.values()),
+            "misses": sum(misses.values()),
+            "endpoints": {
+                endpoint: {"hits": hits.get(endpoint, 0), "misses": misses.get(endpoint, 0)}
+                for endpoint in sorted(set(hits) | set(misses))
+            },
+        }
+
+
+def build_backend():
+    if CACHE_BACKEND == "redis":
+        if redis is None:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed, using memory cache")
+        else:
+            return RedisBackend(redis.Redis.from_url(REDIS_URL))
+    return MemoryBackend()
+
+
+response_cache = ResponseCache(build_backend())
@@ -0,0 +1,121 @@
+# ClimbTanzania/backend/app/clustering.py
+import logging
+import math
+import threading
+from typing import Optional
+
+from app.models import add_climb as models
+from app.versions import table_version
+
+logger = logging.getLogger(__name__)
+
+MAX_CLUSTER_ZOOM = 16
+CLUSTER_RADIUS_PX = 60
+TILE_SIZE_PX = 256
+
+
+def _project(longitude: float, latitude: float):
+    """Project to Web Mercator world coordinates in the range [0, 1)."""
+    x = longitude / 360.0 + 0.5
+    sin_lat = math.sin(math.radians(max(min(latitude, 85.0511), -85.0511)))
+    y = 0.5 - 0.25 * math.log((1 + sin_lat) / (1 - sin_lat)) / math.pi
+    return x, y
+
+
+def _cell(x: float, y: float, zoom: int):
+    scale = (2 ** zoom) * TILE_SIZE_PX / CLUSTER_RADIUS_PX
+    return int(x * scale), int(y * scale)
+
+
+class ClusterIndex:
+    """Grid clusters of climbs for every zoom level, cached in memory.
+
+    The finest zoom is built from the climbs table and each coarser zoom is
+    merged from the one below it, since a grid cell at zoom z is exactly the
+    union of its four children at z + 1. Levels are built per climb type on
+    first use and labelled with the ``climbs`` entry of ``table_versions``,
+    so they are rebuilt after a write from any worker or the importer.
+    Above ``MAX_CLUSTER_ZOOM`` every climb is returned on its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._levels = {}
+
+    def _build(self, db, climb_type: Optional[str]):
+        query = db.query(models.Climb.id, models.Climb.longitude, models.Climb.latitude)
+        if climb_type:
+            query = query.filter(models.Climb.type == climb_type)
+
+        # Each cell holds [count, sum_lon, sum_lat, climb_id of a single-point cell]
+        finest = {}
+        # The climbs of each finest cell, for zooms past the last cluster level
+        points = {}
+        for climb_id, longitude, latitude in query.all():
+            x, y = _project(longitude, latitude)
+            key = _cell(x, y, MAX_CLUSTER_ZOOM)
+            cell = finest.setdefault(key, [0, 0.0, 0.0, climb_id])
+            cell[0] += 1
+            cell[1] += longitude
+            cell[2] += latitude
+            points.setdefault(key, []).append((climb_id, longitude, latitude))
+
+        levels = [None] * (MAX_CLUSTER_ZOOM + 1)
+        levels[MAX_CLUSTER_ZOOM] = finest
+        for zoom in range(MAX_CLUSTER_ZOOM - 1, -1, -1):
+            merged = {}
+            for (cx, cy), (count, sum_lon, sum_lat, climb_id) in levels[zoom + 1].items():
+                cell = merged.setdefault((cx // 2, cy // 2), [0, 0.0, 0.0, climb_id])
+                cell[0] += count
+                cell[1] += sum_lon
+                cell[2] += sum_lat
+            levels[zoom] = merged
+
+        logger.debug(f"Built climb clusters for type={climb_type!r} from {len(finest)} cells")
+        return levels, points
+
+    def _load(self, db, climb_type: Optional[str]):
+        # Read before building: levels built while climbs change are labelled
+        # with the older version and rebuilt on the next request
+        version = table_version(db, "climbs")
+        cached = self._levels.get(climb_type)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        levels, points = self._build(db, climb_type)
+        with self._lock:
+            self._levels[climb_type] = (version, levels, points)
+        return levels, points
+
+    def clusters(self, db, zoom: int, min_lon: float, min_lat: float, max_lon: float, max_lat: float, climb_type: Optional[str] = None):
+        levels, points = self._load(db, climb_type)
+
+        min_x, max_y = _project(min_lon, min_lat)
+        max_x, min_y = _project(max_lon, max_lat)
+        min_cx, min_cy = _cell(min_x, min_y, min(zoom, MAX_CLUSTER_ZOOM))
+        max_cx, max_cy = _cell(max_x, max_y, min(zoom, MAX_CLUSTER_ZOOM))
+
+        if zoom > MAX_CLUSTER_ZOOM:
+            # Climbs a few metres apart would share a cell at any cluster
+            # level, so past the last one they are listed individually
+            return [
+                {"lat": latitude, "lon": longitude, "count": 1, "id": climb_id}
+                for (cx, cy), cell_points in points.items()
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+                for climb_id, longitude, latitude in cell_points
+                if min_lon <= longitude <= max_lon and min_lat <= latitude <= max_lat
+            ]
+
+        result = []
+        for (cx, cy), (count, sum_lon, sum_lat, climb_id) in levels[max(zoom, 0)].items():
+            if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                result.append({
+                    "lat": sum_lat / count,
+                    "lon": sum_lon / count,
+                    "count": count,
+                    "id": climb_id if count == 1 else None,
+                })
+        return result
+
+
+cluster_index = ClusterIndex()
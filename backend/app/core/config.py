@@ -0,0 +1,31 @@
+from dotenv import load_dotenv
+import os
+
+# Load environment variables from a .env file
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Connection budget of the whole process. The sync engine (plain def
+# endpoints, CLI) and the async engine (async def endpoints) each have a
+# pool, and the two split these totals: DB_ASYNC_POOL_SHARE of each goes to
+# the async pool and the rest to the sync pool. Each pool keeps at least one
+# connection, so with DB_POOL_SIZE >= 2 a process never holds more than
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_ASYNC_POOL_SHARE = float(os.getenv("DB_ASYNC_POOL_SHARE", "0.5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+# 0 disables the server-side timeout
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+# Behind PgBouncer in transaction mode: no client-side pool, no startup
+# options and no server-side prepared statement cache
+DB_PGBOUNCER = _env_bool("DB_PGBOUNCER", False)
@@ -1,18 +1,23 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+from app.core import config
+from app.db.pool import pool_options, attach_metrics, sync_pool_metrics
 
-# Load environment variables from a .env file
-load_dotenv()
-
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
 
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("No DATABASE_URL set for SQLAlchemy connection")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+connect_args = {}
+if config.DB_STATEMENT_TIMEOUT_MS and not config.DB_PGBOUNCER:
+    connect_args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+
+# The one sync engine of the process; every Session and dependency binds to it
+engine = attach_metrics(
+    create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, **pool_options()),
+    sync_pool_metrics,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -23,4 +28,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
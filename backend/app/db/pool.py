@@ -0,0 +1,128 @@
+import threading
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core import config
+
+
+class PoolMetrics:
+    """Checkout wait times and saturation of one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self._timeouts += 1
+                return
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    def snapshot(self):
+        with self._lock:
+            stats = {
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "capacity": capacity,
+                "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+            })
+        return stats
+
+
+class _TimedCheckout:
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+def _split(total: int, asynchronous: bool, minimum: int = 0) -> int:
+    share = min(max(config.DB_ASYNC_POOL_SHARE, 0.0), 1.0)
+    async_part = round(total * share)
+    if total >= 2 * minimum:
+        async_part = min(max(async_part, minimum), total - minimum)
+    return async_part if asynchronous else total - async_part
+
+
+def pool_budget(asynchronous: bool = False):
+    """``(pool_size, max_overflow)`` of one engine's share of the process budget."""
+    size = max(_split(config.DB_POOL_SIZE, asynchronous, minimum=1), 1)
+    return size, _split(config.DB_MAX_OVERFLOW, asynchronous)
+
+
+def pool_options(asynchronous: bool = False) -> dict:
+    """Keyword arguments for create_engine/create_async_engine from the config."""
+    if config.DB_PGBOUNCER:
+        # PgBouncer owns the pooling; keep no idle connections in the process
+        return {"poolclass": NullPool}
+
+    pool_size, max_overflow = pool_budget(asynchronous)
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if asynchronous else TimedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+
+def attach_metrics(engine, metrics: PoolMetrics):
+    pool = engine.pool
+    if isinstance(pool, _TimedCheckout):
+        pool.metrics = metrics
+        metrics.pool = pool
+    return engine
+
+
+def pool_stats():
+    return {
+        "pgbouncer": config.DB_PGBOUNCER,
+        "sync": sync_pool_metrics.snapshot(),
+        "async": async_pool_metrics.snapshot(),
+    }
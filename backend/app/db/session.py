@@ -0,0 +1,36 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core import config
+from app.db.pool import pool_options, attach_metrics, async_pool_metrics
+
+
+def to_async_url(url: str):
+    """Point a sync Postgres URL at the asyncpg driver."""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    # asyncpg spells libpq's sslmode as ssl
+    if "sslmode" in async_url.query:
+        query = dict(async_url.query)
+        query["ssl"] = query.pop("sslmode")
+        async_url = async_url.set(query=query)
+    return async_url
+
+
+ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL or to_async_url(config.DATABASE_URL)
+
+connect_args = {}
+if config.DB_PGBOUNCER:
+    # Transaction pooling hands each transaction a different server connection,
+    # so prepared statements must not be cached across them
+    connect_args["statement_cache_size"] = 0
+    connect_args["prepared_statement_cache_size"] = 0
+elif config.DB_STATEMENT_TIMEOUT_MS:
+    connect_args["server_settings"] = {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, connect_args=connect_args, **pool_options(asynchronous=True))
+attach_metrics(async_engine.sync_engine, async_pool_metrics)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,227 @@
+# ClimbTanzania/backend/app/feed.py
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Integer, String, DateTime, Float, insert, literal, select, update
+
+from app.cache import CACHE_TTL_SECONDS
+from app.grades import BIG_TICK_VALUE, grade_value
+from app.models import add_climb as models
+
+logger = logging.getLogger(__name__)
+
+FEED_RING_SIZE = int(os.getenv("FEED_RING_SIZE", "50"))
+FEED_RING_TTL_SECONDS = int(os.getenv("FEED_RING_TTL_SECONDS", str(CACHE_TTL_SECONDS)))
+
+TICK = "tick"
+FIRST_ASCENT = "first_ascent"
+
+Entry = models.ActivityFeedEntry
+
+# Each feed as (SQL filter, the same test on an in-memory entry)
+FEEDS = {
+    "recent": (
+        lambda: [Entry.kind == TICK],
+        lambda entry: entry["kind"] == TICK,
+    ),
+    "big_ticks": (
+        lambda: [Entry.kind == TICK, Entry.grade_value >= BIG_TICK_VALUE],
+        lambda entry: entry["kind"] == TICK and (entry["grade_value"] or 0) >= BIG_TICK_VALUE,
+    ),
+    "first_ascents": (
+        lambda: [Entry.kind == FIRST_ASCENT, Entry.user_id.isnot(None)],
+        lambda entry: entry["kind"] == FIRST_ASCENT and entry["user_id"] is not None,
+    ),
+}
+
+
+def occurred_at(value) -> datetime:
+    """Timestamp for a free-text date, falling back to now when it can't be read."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if value:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip())
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def _sort_key(entry):
+    return entry["occurred_at"], entry["id"]
+
+
+def tick_entry_statement(log, username: str):
+    """Insert the feed row for a new log, taking the climb's name and type from ``climbs``.
+
+    ``log`` is the row returned by ``user_lists.add_entry`` for ``models.Log``,
+    including its ``grade_value``.
+    """
+    source = select(
+        literal(TICK, String),
+        literal(log.id, Integer),
+        models.Climb.id,
+        literal(log.user_id, Integer),
+        literal(username, String),
+        models.Climb.name,
+        models.Climb.type,
+        literal(log.grade, String),
+        literal(log.grade_value, Float),
+        literal(log.comment, String),
+        literal(log.date, String),
+        literal(occurred_at(log.date), DateTime(timezone=True)),
+    ).where(models.Climb.id == log.climb_id)
+    columns = [
+        "kind", "log_id", "climb_id", "user_id", "username", "climb_name", "climb_type",
+        "grade", "grade_value", "comment", "date", "occurred_at",
+    ]
+    return insert(Entry).from_select(columns, source).returning(*Entry.__table__.c)
+
+
+def first_ascent_entries(db, climbs):
+    """Feed rows for newly written climbs that name a first ascensionist.
+
+    ``climbs`` are mappings with the climb columns including ``id``. Users are
+    matched by username in one query; unmatched names are kept so the row can
+    be linked when that user registers.
+    """
+    climbs = [climb for climb in climbs if climb.get("first_ascensionist")]
+    if not climbs:
+        return []
+
+    names = {climb["first_ascensionist"] for climb in climbs}
+    user_ids = dict(
+        db.query(models.User.username, models.User.id).filter(models.User.username.in_(names)).all()
+    )
+    return [
+        {
+            "kind": FIRST_ASCENT,
+            "climb_id": climb["id"],
+            "user_id": user_ids.get(climb["first_ascensionist"]),
+            "username": climb["first_ascensionist"],
+            "climb_name": climb.get("name"),
+            "climb_type": climb.get("type"),
+            "grade": climb.get("grade"),
+            "grade_value": grade_value(climb.get("grade"), climb.get("type")),
+            "date": climb.get("first_ascent_date"),
+            "occurred_at": occurred_at(climb.get("first_ascent_date")),
+        }
+        for climb in climbs
+    ]
+
+
+def record_first_ascents(db, climbs):
+    """Insert first-ascent feed rows in the caller's transaction and return them."""
+    entries = first_ascent_entries(db, climbs)
+    if not entries:
+        return []
+    rows = db.execute(insert(Entry).returning(*Entry.__table__.c, sort_by_parameter_order=True), entries)
+    return [dict(row) for row in rows.mappings()]
+
+
+def link_first_ascents_statement(user_id: int, username: str):
+    """Attach first ascents recorded under ``username`` before the account existed."""
+    return (
+        update(Entry)
+        .where(Entry.kind == FIRST_ASCENT, Entry.user_id.is_(None), Entry.username == username)
+        .values(user_id=user_id)
+    )
+
+
+def tick_response(entry):
+    """Shape of ``schemas.LogWithUser``."""
+    return {
+        "id": entry["log_id"],
+        "climb_id": entry["climb_id"],
+        "date": entry["date"],
+        "grade": entry["grade"],
+        "comment": entry["comment"],
+        "user_id": entry["user_id"],
+        "username": entry["username"],
+        "name": entry["climb_name"],
+        "type": entry["climb_type"],
+    }
+
+
+def first_ascent_response(entry):
+    """Shape of ``schemas.ClimbWithUser``."""
+    return {
+        "id": entry["climb_id"],
+        "name": entry["climb_name"],
+        "grade": entry["grade"],
+        "first_ascent_date": entry["date"],
+        "type": entry["climb_type"],
+        "username": entry["username"],
+        "user_id": entry["user_id"],
+    }
+
+
+class ActivityFeed:
+    """In-memory ring of the newest entries of each home-page feed.
+
+    A ring is filled from an ``activity_feed`` index scan on first read and
+    kept current by ``push`` for writes made in this process. Rings are
+    reloaded after ``ttl`` seconds so writes from other workers show up, and
+    reads deeper than the ring go straight to the table.
+    """
+
+    def __init__(self, size: int = FEED_RING_SIZE, ttl: int = FEED_RING_TTL_SECONDS):
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rings = {}
+        self._generation = 0
+
+    def _query(self, db, feed: str, limit: int):
+        sql_filters, _ = FEEDS[feed]
+        rows = db.execute(
+            select(Entry.__table__)
+            .where(*sql_filters())
+            .order_by(Entry.occurred_at.desc(), Entry.id.desc())
+            .limit(limit)
+        ).mappings()
+        return [dict(row) for row in rows]
+
+    def read(self, db, feed: str, limit: int):
+        if limit > self.size:
+            return self._query(db, feed, limit)
+
+        with self._lock:
+            ring = self._rings.get(feed)
+            generation = self._generation
+        if ring is None or ring[0] < time.monotonic():
+            entries = self._query(db, feed, self.size)
+            ring = (time.monotonic() + self.ttl, entries)
+            with self._lock:
+                # Don't keep a ring read while another request was writing
+                if generation == self._generation:
+                    self._rings[feed] = ring
+        return ring[1][:limit]
+
+    def push(self, entry):
+        with self._lock:
+            self._generation += 1
+            for feed, (_, matches) in FEEDS.items():
+                ring = self._rings.get(feed)
+                if ring is None or not matches(entry):
+                    continue
+                # A read between the writer's commit and this push may have loaded it already
+                if any(existing["id"] == entry["id"] for existing in ring[1]):
+                    continue
+                entries = sorted(ring[1] + [entry], key=_sort_key, reverse=True)[:self.size]
+                self._rings[feed] = (ring[0], entries)
+
+    def invalidate(self, *feeds):
+        with self._lock:
+            self._generation += 1
+            for feed in feeds or list(self._rings):
+                self._rings.pop(feed, None)
+
+
+activity_feed = ActivityFeed()
@@ -0,0 +1,194 @@
+# ClimbTanzania/backend/app/importer.py
+import codecs
+import csv
+import json
+import logging
+import time
+import xml.etree.ElementTree as ET
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from app.feed import activity_feed, record_first_ascents
+from app.kml import _local, open_kml
+from app.models import add_climb as models
+from app.schemas import add_climb as schemas
+from app.spatial import area_index
+
+try:
+    import ijson
+except ImportError:  # Without ijson GeoJSON files are parsed in one piece
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".geojson": "geojson",
+    ".json": "geojson",
+    ".kml": "kml",
+    ".kmz": "kmz",
+}
+
+KML_NS = "{http://www.opengis.net/kml/2.2}"
+
+
+def detect_format(filename: str):
+    for suffix, fmt in IMPORT_FORMATS.items():
+        if filename.lower().endswith(suffix):
+            return fmt
+    return None
+
+
+def iter_csv_rows(stream):
+    """Yield ``(row_number, fields)`` from a CSV file with a header row."""
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, row
+
+
+def _feature_fields(feature):
+    fields = dict(feature.get("properties") or {})
+    geometry = feature.get("geometry") or {}
+    if geometry.get("type") == "Point":
+        coordinates = geometry.get("coordinates") or []
+        if len(coordinates) >= 2:
+            fields["longitude"], fields["latitude"] = coordinates[0], coordinates[1]
+    return fields
+
+
+def iter_geojson_rows(stream):
+    """Yield ``(row_number, fields)`` for each Point feature of a FeatureCollection."""
+    if ijson is not None:
+        features = ijson.items(stream, "features.item", use_float=True)
+    else:
+        features = json.load(stream).get("features", [])
+    for row_number, feature in enumerate(features, start=1):
+        yield row_number, _feature_fields(feature)
+
+
+def iter_kml_rows(stream):
+    """Yield ``(row_number, fields)`` for each Point Placemark of a KML document.
+
+    Placemarks are handled as their end tag is parsed and then cleared, so
+    memory stays flat however many the file holds. The name, description and
+    any ``ExtendedData`` values become climb fields.
+    """
+    row_number = 0
+    for event, element in ET.iterparse(stream, events=("end",)):
+        if _local(element.tag) != "Placemark":
+            continue
+        row_number += 1
+
+        fields = {}
+        for child in element.iter():
+            tag = _local(child.tag)
+            if tag in ("name", "description") and tag not in fields:
+                fields[tag] = (child.text or "").strip()
+            elif tag == "Data" and child.get("name"):
+                value = child.find(f"{KML_NS}value")
+                if value is None:
+                    value = child.find("value")
+                fields[child.get("name")] = (value.text or "").strip() if value is not None else None
+            elif tag == "SimpleData" and child.get("name"):
+                fields[child.get("name")] = (child.text or "").strip()
+            elif tag == "Point":
+                coordinates = next((c.text for c in child.iter() if _local(c.tag) == "coordinates"), None)
+                if coordinates:
+                    parts = coordinates.strip().split(",")
+                    if len(parts) >= 2:
+                        fields["longitude"], fields["latitude"] = parts[0], parts[1]
+        element.clear()
+        yield row_number, fields
+
+
+ROW_READERS = {
+    "csv": iter_csv_rows,
+    "geojson": iter_geojson_rows,
+    "kml": iter_kml_rows,
+    "kmz": lambda stream: iter_kml_rows(open_kml("upload.kmz", stream)),
+}
+
+
+def _clean(fields):
+    # Blank cells mean "not given" rather than an empty string or a bad number
+    return {
+        name: value
+        for name, value in fields.items()
+        if name and not (isinstance(value, str) and value.strip() == "")
+    }
+
+
+def _error_messages(e: ValidationError):
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in e.errors()
+    ]
+
+
+def import_climbs(db, rows, dry_run: bool = False, batch_size: int = IMPORT_BATCH_SIZE):
+    """Validate and insert climbs from ``(row_number, fields)`` pairs.
+
+    Each row is checked against ``schemas.ClimbCreate``, given its area from
+    the in-memory area index and inserted in batches of ``batch_size`` with
+    one executemany per batch, followed by the batch's first-ascent feed
+    rows. Invalid rows are reported by number and do not stop the import.
+    Everything is written in one transaction, which is rolled back with
+    ``dry_run``.
+    """
+    started = time.perf_counter()
+    # Rebuilt here if areas were uploaded since this process last loaded them
+    area_index.ensure_loaded(db)
+
+    created = 0
+    error_count = 0
+    errors = []
+    batch = []
+    feed_entries = []
+
+    def flush():
+        nonlocal created
+        if batch and not dry_run:
+            ids = db.execute(
+                insert(models.Climb).returning(models.Climb.id, sort_by_parameter_order=True), batch
+            ).scalars().all()
+            feed_entries.extend(record_first_ascents(db, [values | {"id": climb_id} for values, climb_id in zip(batch, ids)]))
+        created += len(batch)
+        batch.clear()
+
+    try:
+        for row_number, fields in rows:
+            try:
+                climb = schemas.ClimbCreate.model_validate(_clean(fields))
+            except ValidationError as e:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": row_number, "errors": _error_messages(e)})
+                continue
+
+            values = climb.model_dump()
+            values["area"] = area_index.area_name_for(climb.longitude, climb.latitude)
+            batch.append(values)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    except Exception:
+        db.rollback()
+        raise
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+        for entry in feed_entries:
+            activity_feed.push(entry)
+
+    return {
+        "dry_run": dry_run,
+        "created": created,
+        "error_count": error_count,
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
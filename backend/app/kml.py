@@ -0,0 +1,119 @@
+# ClimbTanzania/backend/app/kml.py
+import logging
+import os
+import xml.etree.ElementTree as ET
+import zipfile
+
+from shapely.geometry import MultiPolygon, Polygon
+from shapely.ops import unary_union
+from shapely.validation import make_valid
+
+logger = logging.getLogger(__name__)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def open_kml(filename: str, stream):
+    """Return a stream of KML, unpacking the main document of a KMZ archive."""
+    if not filename.lower().endswith(".kmz"):
+        return stream
+    archive = zipfile.ZipFile(stream)
+    names = [name for name in archive.namelist() if name.lower().endswith(".kml")]
+    if not names:
+        raise ValueError("KMZ archive does not contain a KML document")
+    # doc.kml is the conventional root document; otherwise take the first one
+    main = next((name for name in names if os.path.basename(name).lower() == "doc.kml"), names[0])
+    return archive.open(main)
+
+
+def _ring(element):
+    for child in element.iter():
+        if _local(child.tag) == "coordinates" and child.text:
+            coords = []
+            for point in child.text.split():
+                try:
+                    lon, lat = map(float, point.split(",")[:2])
+                except ValueError as e:
+                    logger.error(f"Invalid coordinate value: {point} - {e}")
+                    continue
+                coords.append((lon, lat))
+            return coords
+    return []
+
+
+def _polygon(element):
+    shell, holes = [], []
+    for child in element:
+        tag = _local(child.tag)
+        if tag == "outerBoundaryIs":
+            shell = _ring(child)
+        elif tag == "innerBoundaryIs":
+            # Some writers put several LinearRings in one innerBoundaryIs
+            for ring in child:
+                if _local(ring.tag) == "LinearRing":
+                    hole = _ring(ring)
+                    if len(hole) >= 3:
+                        holes.append(hole)
+    if len(shell) < 3:
+        return None
+    return Polygon(shell, holes)
+
+
+def as_multipolygon(geometry):
+    """Coerce a polygonal geometry to a valid MultiPolygon, or None if nothing is left."""
+    if not geometry.is_valid:
+        geometry = make_valid(geometry)
+    if geometry.geom_type == "Polygon":
+        parts = [geometry]
+    elif geometry.geom_type == "MultiPolygon":
+        parts = list(geometry.geoms)
+    else:
+        # make_valid can return a collection with stray lines or points
+        parts = []
+        for part in getattr(geometry, "geoms", []):
+            if part.geom_type == "Polygon":
+                parts.append(part)
+            elif part.geom_type == "MultiPolygon":
+                parts.extend(part.geoms)
+    parts = [part for part in parts if not part.is_empty]
+    return MultiPolygon(parts) if parts else None
+
+
+def iter_kml_areas(stream, default_name: str = "Area"):
+    """Yield ``(name, MultiPolygon)`` for every polygon Placemark in a KML document.
+
+    The document is read with ``iterparse`` and each Placemark is cleared once
+    handled, so Folders and large files are walked without building the whole
+    tree. Every Polygon inside a Placemark, including those in MultiGeometry,
+    becomes one part, and inner boundaries become holes. Placemarks without a
+    name are called after ``default_name``.
+    """
+    count = 0
+    for event, element in ET.iterparse(stream, events=("end",)):
+        if _local(element.tag) != "Placemark":
+            continue
+
+        name = None
+        for child in element:
+            if _local(child.tag) == "name" and child.text and child.text.strip():
+                name = child.text.strip()
+                break
+
+        polygons = [
+            polygon
+            for polygon in (_polygon(child) for child in element.iter() if _local(child.tag) == "Polygon")
+            if polygon is not None
+        ]
+        element.clear()
+        if not polygons:
+            continue
+
+        geometry = as_multipolygon(unary_union(polygons) if len(polygons) > 1 else polygons[0])
+        if geometry is None:
+            logger.error(f"Skipping Placemark '{name}' without a usable polygon")
+            continue
+
+        count += 1
+        yield name or f"{default_name} {count}", geometry
@@ -1,11 +1,53 @@
 # ClimbTanzania/backend/app/models/add_climb.py
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Index, UniqueConstraint, Computed, DateTime, func, text, event, DDL, cast
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import relationship, validates, deferred
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, array
 from geoalchemy2 import Geometry
 
+from app.grades import grade_value
+
 Base = declarative_base()
 
+# The trigram indexes below need pg_trgm before create_all builds them
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+CLIMB_TAG_ARRAY = (
+    "CASE WHEN btrim(coalesce(tags, '')) = '' THEN '{}'::text[] "
+    "ELSE regexp_split_to_array(upper(btrim(tags)), '\\s*,\\s*') END"
+)
+
+
+def climb_tags_filter(tags, match: str = "any"):
+    """Filter on Climb.tag_array: overlap for "any", containment for "all".
+
+    The literal is cast to text[] so the operators compare the column's own
+    type; left alone, asyncpg binds the elements as varchar.
+    """
+    wanted = cast(array(list(tags)), ARRAY(Text))
+    if match == "all":
+        return Climb.tag_array.contains(wanted)
+    return Climb.tag_array.overlap(wanted)
+
+
+# Names weigh most, then tags, then descriptions
+CLIMB_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', replace(coalesce(tags, ''), ',', ' ')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def _climb_grade_value(context):
+    params = context.get_current_parameters()
+    return grade_value(params.get("grade"), params.get("type"))
+
+
+# Without the climb type; the API passes grades.grade_value_for_type instead
+def _log_grade_value(context):
+    return grade_value(context.get_current_parameters().get("grade"))
+
+
 class Climb(Base):
     __tablename__ = 'climbs'
     id = Column(Integer, primary_key=True, index=True)
@@ -14,15 +56,37 @@ class Climb(Base):
     name = Column(String, index=True)
     type = Column(String, index=True)
     grade = Column(String, index=True)
+    # Numeric difficulty from app.grades, filled in from grade and type on insert
+    grade_value = Column(Float, default=_climb_grade_value)
     quality = Column(Integer)
     first_ascensionist = Column(String)
     first_ascent_date = Column(String)
     area = Column(String, index=True)  # Use area as a string field
     description = Column(String)
     tags = Column(String)
-    logs = relationship("Log", back_populates="climb")
-    ticklists = relationship("Ticklist", back_populates="climb")
-    hitlists = relationship("Hitlist", back_populates="climb")
+    # Point maintained by Postgres from latitude/longitude, GiST indexed as idx_climbs_geom
+    geom = deferred(Column(
+        Geometry('POINT', srid=4326),
+        Computed("ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)", persisted=True),
+    ))
+    # tags split into an upper-case array by Postgres, GIN indexed for tag filters
+    tag_array = deferred(Column(ARRAY(Text), Computed(CLIMB_TAG_ARRAY, persisted=True)))
+    # Weighted full-text document maintained by Postgres, GIN indexed
+    search_vector = deferred(Column(TSVECTOR, Computed(CLIMB_SEARCH_DOCUMENT, persisted=True)))
+    # Relationships never lazy-load: queries join or eager-load what they read
+    logs = relationship("Log", back_populates="climb", lazy="raise_on_sql")
+    ticklists = relationship("Ticklist", back_populates="climb", lazy="raise_on_sql")
+    hitlists = relationship("Hitlist", back_populates="climb", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # Supports bounding-box range scans when a new area is assigned
+        Index('ix_climbs_longitude_latitude', 'longitude', 'latitude'),
+        # Serves grade range filters and (grade_value, id) keyset ordering
+        Index('ix_climbs_grade_value_id', 'grade_value', 'id'),
+        Index('ix_climbs_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_climbs_tag_array', 'tag_array', postgresql_using='gin'),
+        Index('ix_climbs_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     @validates('tags')
     def convert_tags_to_uppercase(self, key, value):
@@ -35,7 +99,7 @@ class Area(Base):
     __tablename__ = 'areas'
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
-    polygon = Column(Geometry('POLYGON'))
+    polygon = Column(Geometry('MULTIPOLYGON', srid=4326))  # GiST indexed as idx_areas_polygon
 
 class User(Base):
     __tablename__ = "users"
@@ -43,17 +107,26 @@ class User(Base):
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
-    logs = relationship("Log", back_populates="user")
-    ticklists = relationship("Ticklist", back_populates="user")
-    hitlists = relationship("Hitlist", back_populates="user")
+    logs = relationship("Log", back_populates="user", lazy="raise_on_sql")
+    ticklists = relationship("Ticklist", back_populates="user", lazy="raise_on_sql")
+    hitlists = relationship("Hitlist", back_populates="user", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # Fuzzy and substring username search
+        Index('ix_users_username_trgm', 'username', postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'}),
+    )
 
 class Ticklist(Base):
     __tablename__ = "ticklist"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     climb_id = Column(Integer, ForeignKey("climbs.id"))
-    user = relationship("User", back_populates="ticklists")
-    climb = relationship("Climb", back_populates="ticklists")
+    user = relationship("User", back_populates="ticklists", lazy="raise_on_sql")
+    climb = relationship("Climb", back_populates="ticklists", lazy="raise_on_sql")
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'climb_id', name='uq_ticklist_user_id_climb_id'),
+    )
 
 
 class Hitlist(Base):
@@ -61,8 +134,12 @@ class Hitlist(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     climb_id = Column(Integer, ForeignKey("climbs.id"))
-    user = relationship("User", back_populates="hitlists")
-    climb = relationship("Climb", back_populates="hitlists")
+    user = relationship("User", back_populates="hitlists", lazy="raise_on_sql")
+    climb = relationship("Climb", back_populates="hitlists", lazy="raise_on_sql")
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'climb_id', name='uq_hitlist_user_id_climb_id'),
+    )
 
 
 class Log(Base):
@@ -72,7 +149,52 @@ class Log(Base):
     climb_id = Column(Integer, ForeignKey("climbs.id"))
     date = Column(String)
     grade = Column(String)
+    grade_value = Column(Float, default=_log_grade_value)
+    comment = Column(String(100))
+
+    user = relationship("User", back_populates="logs", lazy="raise_on_sql")
+    climb = relationship("Climb", back_populates="logs", lazy="raise_on_sql")
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'climb_id', name='uq_logs_user_id_climb_id'),
+        Index('ix_logs_grade_value', 'grade_value'),
+    )
+
+
+class TableVersion(Base):
+    """Change counter per catalog table, used to build ETags and Last-Modified."""
+    __tablename__ = "table_versions"
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class ActivityFeedEntry(Base):
+    """Denormalized home-page activity: one row per log ("tick") and per first ascent.
+
+    Rows carry everything the feeds return plus a numeric grade and a real
+    timestamp, so each feed is a top-N read of one index.
+    """
+    __tablename__ = "activity_feed"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    log_id = Column(Integer, ForeignKey("logs.id", ondelete="CASCADE"), unique=True)
+    climb_id = Column(Integer, ForeignKey("climbs.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    username = Column(String)
+    climb_name = Column(String)
+    climb_type = Column(String)
+    grade = Column(String)
+    grade_value = Column(Float)
     comment = Column(String(100))
+    date = Column(String)  # As entered, returned unchanged by the feeds
+    occurred_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
-    user = relationship("User", back_populates="logs")
-    climb = relationship("Climb", back_populates="logs")
+    __table_args__ = (
+        Index('ix_activity_feed_kind_occurred_at', 'kind', occurred_at.desc(), id.desc()),
+        # The cut-off is app.grades.BIG_TICK_VALUE
+        Index(
+            'ix_activity_feed_big_ticks', occurred_at.desc(), id.desc(),
+            postgresql_where=text("kind = 'tick' AND grade_value >= 50"),
+        ),
+    )
@@ -33,6 +33,50 @@ class Climb(ClimbBase):
     class Config:
         from_attributes = True
 
+# Listing row without the free-text description and tags; see /climbs/{id} for those
+class ClimbSummary(BaseModel):
+    id: int
+    name: str
+    type: str
+    grade: Optional[str] = None
+    quality: Optional[int] = None
+    area: Optional[str] = None
+    latitude: float
+    longitude: float
+    first_ascensionist: Optional[str] = None
+    first_ascent_date: Optional[str] = None
+
+# Compact climb marker returned by the map bounding-box endpoint
+class ClimbPoint(BaseModel):
+    id: int
+    name: Optional[str] = None
+    lat: float
+    lon: float
+    grade: Optional[str] = None
+    type: Optional[str] = None
+
+# Grid cluster of climbs returned by the map cluster endpoint
+class ClimbCluster(BaseModel):
+    lat: float
+    lon: float
+    count: int
+    id: Optional[int] = None  # Set when the cluster is a single climb
+
+# How many climbs carry a tag, for the tag filter
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+# One ranked hit from the search endpoint
+class SearchResult(BaseModel):
+    kind: str  # "climb" or "user"
+    id: int
+    name: str  # Climb name or username
+    rank: float
+    grade: Optional[str] = None
+    type: Optional[str] = None
+    area: Optional[str] = None
+
 # Area Base Model
 class AreaBase(BaseModel):
     name: str
@@ -69,6 +113,11 @@ class User(UserBase):
 class TokenData(BaseModel):
     username: str
 
+# Identity of the authenticated user, resolved from the access token
+class CurrentUser(BaseModel):
+    id: int
+    username: str
+
 # Climb ID Request Model
 class ClimbIDRequest(BaseModel):
     climb_id: int
@@ -105,6 +154,13 @@ class HitList(HitListBase):
     class Config:
         from_attributes = True
 
+# Per-user state of one climb, returned by the batched membership endpoint
+class ClimbMembership(BaseModel):
+    climb_id: int
+    ticked: bool = False
+    hitlisted: bool = False
+    logged: bool = False
+
 # Log Base Model
 class LogBase(BaseModel):
     climb_id: int
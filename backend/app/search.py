@@ -0,0 +1,87 @@
+# ClimbTanzania/backend/app/search.py
+from sqlalchemy import func, literal, null, or_, select, union_all
+
+from app.models import add_climb as models
+
+SEARCH_MAX_LIMIT = 50
+# Each branch ranks skip + limit rows, so deep offsets are refused rather than
+# letting them sort most of the table; refine the query instead
+SEARCH_MAX_SKIP = 200
+MIN_QUERY_LENGTH = 2
+SEARCH_KINDS = ("climb", "user")
+
+
+def like_pattern(text: str) -> str:
+    """Substring ILIKE pattern with the user's own wildcards escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _climb_hits(q: str, limit: int):
+    # Full-text matches come from the search_vector GIN index and fuzzy name
+    # matches from the trigram index; the better of the two scores ranks the row.
+    tsquery = func.websearch_to_tsquery("english", q)
+    rank = func.greatest(
+        func.ts_rank_cd(models.Climb.search_vector, tsquery),
+        func.similarity(models.Climb.name, q),
+    )
+    return (
+        select(
+            literal("climb").label("kind"),
+            models.Climb.id.label("id"),
+            models.Climb.name.label("name"),
+            rank.label("rank"),
+            models.Climb.grade.label("grade"),
+            models.Climb.type.label("type"),
+            models.Climb.area.label("area"),
+        )
+        .where(or_(
+            models.Climb.search_vector.bool_op("@@")(tsquery),
+            models.Climb.name.bool_op("%")(q),
+        ))
+        .order_by(rank.desc(), models.Climb.id)
+        .limit(limit)
+    )
+
+
+def _user_hits(q: str, limit: int):
+    rank = func.similarity(models.User.username, q)
+    return (
+        select(
+            literal("user").label("kind"),
+            models.User.id.label("id"),
+            models.User.username.label("name"),
+            rank.label("rank"),
+            null().label("grade"),
+            null().label("type"),
+            null().label("area"),
+        )
+        .where(or_(
+            models.User.username.bool_op("%")(q),
+            models.User.username.ilike(like_pattern(q), escape="\\"),
+        ))
+        .order_by(rank.desc(), models.User.id)
+        .limit(limit)
+    )
+
+
+def search_statement(q: str, kinds=SEARCH_KINDS, limit: int = 20, skip: int = 0):
+    """Ranked climbs and users matching ``q``, one page of ``limit`` rows after ``skip``.
+
+    Each kind is narrowed by its own index and capped at ``skip + limit``
+    rows before the results are merged, so the cost depends on the page
+    rather than on the size of the catalog.
+    """
+    window = skip + limit
+    branches = []
+    if "climb" in kinds:
+        branches.append(_climb_hits(q, window).subquery().select())
+    if "user" in kinds:
+        branches.append(_user_hits(q, window).subquery().select())
+    merged = union_all(*branches).subquery()
+    return (
+        select(merged)
+        .order_by(merged.c.rank.desc(), merged.c.kind, merged.c.id)
+        .offset(skip)
+        .limit(limit)
+    )
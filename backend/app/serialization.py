@@ -0,0 +1,63 @@
+# ClimbTanzania/backend/app/serialization.py
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.models import add_climb as models
+
+# Columns of schemas.Climb in field order; area_id has no column and is always null
+CLIMB_FIELDS = (
+    "id", "latitude", "longitude", "name", "type", "grade", "quality",
+    "first_ascensionist", "first_ascent_date", "description", "tags", "area",
+)
+# Columns of schemas.ClimbSummary, what index and map pages show
+CLIMB_SUMMARY_FIELDS = (
+    "id", "name", "type", "grade", "quality", "area", "latitude", "longitude",
+    "first_ascensionist", "first_ascent_date",
+)
+CLIMB_VIEWS = {"summary": CLIMB_SUMMARY_FIELDS, "detail": CLIMB_FIELDS}
+CLIMB_VIEW_PATTERN = "^(summary|detail)$"
+
+
+def climb_columns(view: str = "detail"):
+    """Columns to select for a listing ``view``; descriptions are only read for ``detail``."""
+    return tuple(getattr(models.Climb, field) for field in CLIMB_VIEWS[view])
+
+
+def encode(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; already encoded bytes are sent as they are."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return encode(content)
+
+
+def climb_rows(rows, view: str = "detail"):
+    """Dicts for ``view`` from rows selected with ``climb_columns(view)`` first.
+
+    Rows come straight from the database, so they are not re-validated;
+    trailing extra columns (e.g. a sort key) are ignored.
+    """
+    fields = CLIMB_VIEWS[view]
+    if view == "summary":
+        return [dict(zip(fields, row)) for row in rows]
+    return [dict(zip(fields, row), area_id=None) for row in rows]
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """Send ``content`` without response_model validation.
+
+    Headers already set on the injected ``response`` (ETag, cursors) are
+    carried over, since FastAPI drops them when a Response is returned.
+    """
+    headers = None
+    if response is not None:
+        headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return ORJSONResponse(content, headers=headers)
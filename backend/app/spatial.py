@@ -0,0 +1,264 @@
+# ClimbTanzania/backend/app/spatial.py
+import logging
+import threading
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from geoalchemy2.elements import WKBElement
+from geoalchemy2.shape import from_shape, to_shape
+from shapely.geometry import Point
+from shapely.ops import unary_union
+from shapely.prepared import prep
+from shapely.strtree import STRtree
+from sqlalchemy import and_, or_, select, update
+
+from app.kml import as_multipolygon
+from app.models import add_climb as models
+from app.versions import mark_changed_async, table_version, table_version_async
+
+logger = logging.getLogger(__name__)
+
+INDEPENDENT_AREA = "Independent Climbs"
+ASSIGNMENT_BATCH_SIZE = 1000
+
+
+class AreaIndex:
+    """Process-wide STRtree over prepared area polygons.
+
+    The tree is built from the ``areas`` table and swapped in atomically, so
+    lookups never see a half-built index. Each snapshot remembers the
+    ``areas`` entry of ``table_versions`` it was built from, and
+    ``ensure_loaded`` rebuilds it once that version moves on, so areas
+    uploaded through another worker are picked up as well.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    @staticmethod
+    def rows_query():
+        return select(models.Area.id, models.Area.name, models.Area.polygon).order_by(models.Area.id)
+
+    def load(self, rows, version: int):
+        """Build and swap in a snapshot from ``rows_query`` rows."""
+        ids, names, polygons = [], [], []
+        for area_id, name, polygon in rows:
+            if not isinstance(polygon, WKBElement):
+                continue
+            try:
+                shape = to_shape(polygon)
+            except Exception as e:
+                logger.error(f"Skipping area '{name}' with unreadable polygon: {e}")
+                continue
+            ids.append(area_id)
+            names.append(name)
+            polygons.append(shape)
+
+        snapshot = {
+            "version": version,
+            "tree": STRtree(polygons) if polygons else None,
+            "ids": ids,
+            "names": names,
+            "polygons": polygons,
+            "prepared": [prep(polygon) for polygon in polygons],
+            "positions": {area_id: i for i, area_id in enumerate(ids)},
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        logger.debug(f"Area index rebuilt with {len(polygons)} polygons at areas version {version}")
+
+    def rebuild(self, db):
+        # The version is read first: if areas change during the read, the
+        # snapshot is labelled older than its rows and is rebuilt again
+        version = table_version(db, "areas")
+        self.load(db.execute(self.rows_query()).all(), version)
+
+    def is_current(self, version: int) -> bool:
+        snapshot = self._snapshot
+        return snapshot is not None and snapshot["version"] == version
+
+    def ensure_loaded(self, db):
+        if not self.is_current(table_version(db, "areas")):
+            self.rebuild(db)
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def lookup(self, longitude: float, latitude: float) -> Optional[str]:
+        """Return the name of the first area (by id) containing the point."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot["tree"] is None:
+            return None
+
+        point = Point(longitude, latitude)
+        # The tree narrows the search to polygons whose envelope holds the
+        # point; candidates are checked in id order to keep assignment stable.
+        for i in sorted(snapshot["tree"].query(point)):
+            if snapshot["prepared"][i].contains(point):
+                return snapshot["names"][i]
+        return None
+
+    def area_name_for(self, longitude: float, latitude: float) -> str:
+        return self.lookup(longitude, latitude) or INDEPENDENT_AREA
+
+    def polygon(self, area_id: int):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        i = snapshot["positions"].get(area_id)
+        return snapshot["polygons"][i] if i is not None else None
+
+    def prepared_polygon(self, area_id: int):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        i = snapshot["positions"].get(area_id)
+        return snapshot["prepared"][i] if i is not None else None
+
+
+area_index = AreaIndex()
+
+
+def reassign_all_climbs(db, dry_run: bool = False, batch_size: int = ASSIGNMENT_BATCH_SIZE):
+    """Recompute the area of every climb and write the changes in one transaction.
+
+    Climbs are read in keyset batches of bare columns, looked up in the area
+    index and only rows whose area actually changes are written back with
+    ``bulk_update_mappings``. With ``dry_run`` the transaction is rolled back.
+    """
+    started = time.perf_counter()
+    area_index.rebuild(db)
+
+    counts = {}
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(models.Climb.id, models.Climb.longitude, models.Climb.latitude, models.Climb.area)
+            .filter(models.Climb.id > last_id)
+            .order_by(models.Climb.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        mappings = []
+        for climb_id, longitude, latitude, current_area in rows:
+            area_name = area_index.area_name_for(longitude, latitude)
+            counts[area_name] = counts.get(area_name, 0) + 1
+            if area_name != current_area:
+                mappings.append({"id": climb_id, "area": area_name})
+
+        if mappings and not dry_run:
+            db.bulk_update_mappings(models.Climb, mappings)
+        updated += len(mappings)
+        last_id = rows[-1].id
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+    return {
+        "dry_run": dry_run,
+        "updated": updated,
+        "counts": counts,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _candidates_query(bounds):
+    # All boxes are covered by one range scan over the climb coordinates
+    boxes = [
+        and_(
+            models.Climb.longitude.between(min_lon, max_lon),
+            models.Climb.latitude.between(min_lat, max_lat),
+        )
+        for min_lon, min_lat, max_lon, max_lat in bounds
+    ]
+    return select(models.Climb.id, models.Climb.longitude, models.Climb.latitude, models.Climb.area).where(or_(*boxes))
+
+
+def area_changes(candidates):
+    """``{"id", "area"}`` mappings for the candidate climbs whose area changes."""
+    mappings = []
+    for climb_id, longitude, latitude, current_area in candidates:
+        area_name = area_index.area_name_for(longitude, latitude)
+        if area_name != current_area:
+            mappings.append({"id": climb_id, "area": area_name})
+    return mappings
+
+
+def plan_area_writes(areas, existing, mode: str = "replace"):
+    """Work out the polygons to store for an upload, without touching the database.
+
+    ``areas`` are ``(name, MultiPolygon)`` pairs and ``existing`` maps the
+    names already stored to their current polygon. Returns ``(actions,
+    polygons, bounds)``: the per-area action, the WKB to write per name and
+    the envelopes, old and new, whose climbs need their area looked up again.
+    """
+    incoming = {}
+    for name, geometry in areas:
+        # A name repeated within one upload is treated as one area
+        incoming[name] = as_multipolygon(unary_union([incoming[name], geometry])) if name in incoming else geometry
+
+    actions, polygons, bounds = [], {}, []
+    for name, geometry in incoming.items():
+        if name not in existing:
+            actions.append({"name": name, "action": "created"})
+        else:
+            previous = to_shape(existing[name]) if isinstance(existing[name], WKBElement) else None
+            if previous is not None:
+                bounds.append(previous.bounds)
+                if mode == "merge":
+                    geometry = as_multipolygon(unary_union([previous, geometry])) or geometry
+            actions.append({"name": name, "action": "merged" if mode == "merge" else "replaced"})
+        polygons[name] = from_shape(geometry, srid=4326)
+        bounds.append(geometry.bounds)
+    return actions, polygons, bounds
+
+
+async def upsert_areas(db, areas, mode: str = "replace"):
+    """Store ``(name, MultiPolygon)`` pairs and reassign the affected climbs once.
+
+    An area whose name already exists is overwritten with ``mode="replace"``
+    or unioned with the incoming shape with ``mode="merge"``; other names
+    are created. Only reads and writes go through the async session: the
+    unions, the index build and the point lookups run in the threadpool so
+    the event loop stays free. Returns ``(actions, assigned)``.
+    """
+    if not areas:
+        return [], 0
+
+    names = list({name for name, _ in areas})
+    result = await db.execute(
+        select(models.Area).where(models.Area.name.in_(names)).order_by(models.Area.id.desc())
+    )
+    existing = {area.name: area for area in result.scalars()}
+
+    actions, polygons, bounds = await run_in_threadpool(
+        plan_area_writes, areas, {name: area.polygon for name, area in existing.items()}, mode
+    )
+    for name, polygon in polygons.items():
+        if name in existing:
+            existing[name].polygon = polygon
+        else:
+            db.add(models.Area(name=name, polygon=polygon))
+    # Commits the areas with a version bump, so the index rebuilt below is
+    # labelled with the version every worker will read
+    await mark_changed_async(db, "areas")
+
+    version = await table_version_async(db, "areas")
+    rows = (await db.execute(AreaIndex.rows_query())).all()
+    await run_in_threadpool(area_index.load, rows, version)
+
+    candidates = (await db.execute(_candidates_query(bounds))).all()
+    mappings = await run_in_threadpool(area_changes, candidates)
+    if mappings:
+        await db.execute(update(models.Climb), mappings)
+    await db.commit()
+    return actions, len(mappings)
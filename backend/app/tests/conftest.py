@@ -0,0 +1,61 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+# Tests that need Postgres run against a disposable PostGIS database named by
+# TEST_DATABASE_URL and skip without one; its tables are emptied per test
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # app.db reads DATABASE_URL when it is first imported
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+CATALOG_TABLES = ("climbs", "areas", "users", "logs")
+
+
+@pytest.fixture(scope="session")
+def app_main():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import main  # creates the tables
+
+    return main
+
+
+@pytest.fixture
+def db(app_main):
+    from app.db.base import SessionLocal
+    from app.feed import activity_feed
+    from app.versions import mark_changed
+
+    session = SessionLocal()
+    session.execute(text(
+        "TRUNCATE logs, ticklist, hitlist, activity_feed, climbs, areas, users RESTART IDENTITY CASCADE"
+    ))
+    session.commit()
+    # Moves every version key past what earlier tests cached
+    mark_changed(session, *CATALOG_TABLES)
+    activity_feed.invalidate()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def _test_client(app_main):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    # One client for the session: the async pool stays on one event loop
+    with TestClient(app_main.app) as client:
+        # Open a connection in both pools, so dialect setup queries aren't
+        # counted against the first test that uses one
+        client.get("/users/", params={"usernames": "-"})
+        client.get("/climbs/0/logs")
+        yield client
+
+
+@pytest.fixture
+def client(_test_client, db):
+    return _test_client
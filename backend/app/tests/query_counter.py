@@ -0,0 +1,56 @@
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Counts the SQL statements sent through some engines while it is active.
+
+    Wrap a request (e.g. a TestClient call) to see how many round trips it
+    costs; an N+1 shows up as a count that grows with the number of rows.
+    Async engines are counted through their ``sync_engine``.
+    """
+
+    def __init__(self, *engines):
+        self.engines = [getattr(engine, "sync_engine", engine) for engine in engines or _default_engines()]
+        self.statements = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+        return False
+
+
+def _default_engines():
+    from app.db.base import engine
+    from app.db.session import async_engine
+    return engine, async_engine
+
+
+@contextmanager
+def assert_max_queries(limit: int, *engines):
+    """Fail if the wrapped block runs more than ``limit`` statements.
+
+        with assert_max_queries(3):
+            client.get(f"/climbs/{climb_id}/logs")
+    """
+    with QueryCounter(*engines) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(f"Expected at most {limit} SQL statements, ran {counter.count}:\n{listing}")
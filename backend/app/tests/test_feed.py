@@ -0,0 +1,31 @@
+import time
+from datetime import datetime, timezone
+
+from app.feed import ActivityFeed, TICK
+
+
+def _tick(entry_id, minute):
+    return {
+        "id": entry_id, "kind": TICK, "grade_value": 41.0, "user_id": 1,
+        "occurred_at": datetime(2026, 1, 1, 12, minute, tzinfo=timezone.utc),
+    }
+
+
+def _loaded_feed(*entries):
+    feed = ActivityFeed(size=3)
+    feed._rings["recent"] = (time.monotonic() + 60, list(entries))
+    return feed
+
+
+def test_push_keeps_newest_first_within_size():
+    feed = _loaded_feed(_tick(1, 0), _tick(2, 1), _tick(3, 2))
+    feed.push(_tick(4, 3))
+    assert [entry["id"] for entry in feed._rings["recent"][1]] == [4, 3, 2]
+
+
+def test_push_skips_an_entry_the_ring_already_loaded():
+    # The ring was reloaded from the table after the write committed
+    entry = _tick(2, 1)
+    feed = _loaded_feed(entry, _tick(1, 0))
+    feed.push(dict(entry))
+    assert [entry["id"] for entry in feed._rings["recent"][1]] == [2, 1]
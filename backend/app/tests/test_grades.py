@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.grades import BIG_TICK_VALUE, grade_value, grade_value_for_type
+from app.models import add_climb as models
+
+
+@pytest.mark.parametrize("grade, climb_type, expected", [
+    ("6a", "Sport", 36),
+    ("6a+", "Sport", 37),
+    ("8b", "Sport", 50),
+    ("V0", "Boulder", 36),
+    ("V9", "Boulder", 50),
+    ("v10", None, 51),
+    ("7C", "Boulder", 50),
+    ("f7A", None, 45),
+    ("Font 6B+", None, 42),
+    ("5.10a", "Trad", 36),
+    ("5.13d", "Trad", 50),
+])
+def test_known_grades(grade, climb_type, expected):
+    assert grade_value(grade, climb_type) == expected
+
+
+def test_big_tick_threshold_matches_old_filter():
+    assert grade_value("V9") == grade_value("8b") == grade_value("7C") == BIG_TICK_VALUE
+    assert grade_value("V8") < BIG_TICK_VALUE
+    assert grade_value("8a+") < BIG_TICK_VALUE
+
+
+def test_climb_type_decides_between_font_and_french():
+    assert grade_value("7a", "Boulder") == grade_value("7A", "Boulder") == 45
+    assert grade_value("7A", "Sport") == grade_value("7a", "Sport") == 42
+    # Without a type the usual spelling decides
+    assert grade_value("7A") == 45
+    assert grade_value("7a") == 42
+
+
+def test_open_grades_take_the_middle_of_their_range():
+    assert grade_value("5+", "Sport") == 33
+    assert grade_value("5.11", "Trad") == pytest.approx((39.5 + 40 + 41 + 42) / 4)
+    assert grade_value("5.11+", "Trad") == pytest.approx((41 + 42) / 2)
+    assert grade_value("V4+") == 42.5
+
+
+def test_slash_grades_take_the_mean():
+    assert grade_value("7a/7a+", "Sport") == 42.5
+    assert grade_value("V4/V5") == 43
+
+
+@pytest.mark.parametrize("grade", [None, "", "  ", "V99", "hard", "5.4", "7a/hard"])
+def test_unrecognised_grades(grade):
+    assert grade_value(grade) is None
+
+
+def _compile(expression):
+    return str(expression.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_grade_value_for_type_is_a_constant_when_unambiguous():
+    assert _compile(grade_value_for_type("V5", models.Climb.type)) == "44.0"
+
+
+def test_grade_value_for_type_picks_the_scale_from_the_climb():
+    sql = _compile(grade_value_for_type("7A", models.Climb.type))
+    assert "lower(trim(climbs.type)) IN ('boulder', 'bouldering')" in sql
+    assert "THEN 45.0" in sql
+    assert "ELSE 42.0" in sql
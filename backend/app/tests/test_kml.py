@@ -0,0 +1,86 @@
+import io
+import zipfile
+
+import pytest
+from shapely.geometry import Polygon
+
+from app.kml import as_multipolygon, iter_kml_areas, open_kml
+
+KML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <Folder>
+      <Placemark>
+        <name>Crag with a hole</name>
+        <Polygon>
+          <outerBoundaryIs><LinearRing><coordinates>
+            0,0,0 4,0,0 4,4,0 0,4,0 0,0,0
+          </coordinates></LinearRing></outerBoundaryIs>
+          <innerBoundaryIs><LinearRing><coordinates>
+            1,1 2,1 2,2 1,2 1,1
+          </coordinates></LinearRing></innerBoundaryIs>
+        </Polygon>
+      </Placemark>
+      <Placemark>
+        <MultiGeometry>
+          <Polygon><outerBoundaryIs><LinearRing><coordinates>
+            10,10 11,10 11,11 10,11 10,10
+          </coordinates></LinearRing></outerBoundaryIs></Polygon>
+          <Polygon><outerBoundaryIs><LinearRing><coordinates>
+            20,20 21,20 21,21 20,21 20,20
+          </coordinates></LinearRing></outerBoundaryIs></Polygon>
+        </MultiGeometry>
+      </Placemark>
+      <Placemark>
+        <name>A pin, not an area</name>
+        <Point><coordinates>5,5</coordinates></Point>
+      </Placemark>
+    </Folder>
+  </Document>
+</kml>
+"""
+
+
+def test_every_polygon_placemark_becomes_a_multipolygon():
+    areas = list(iter_kml_areas(io.BytesIO(KML), default_name="Upload"))
+
+    assert [name for name, _ in areas] == ["Crag with a hole", "Upload 2"]
+    crag, unnamed = areas[0][1], areas[1][1]
+    assert crag.geom_type == unnamed.geom_type == "MultiPolygon"
+    assert crag.area == 16 - 1
+    assert len(unnamed.geoms) == 2
+
+
+def test_kmz_is_unpacked():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("files/readme.txt", "not kml")
+        archive.writestr("doc.kml", KML)
+    buffer.seek(0)
+
+    areas = list(iter_kml_areas(open_kml("areas.KMZ", buffer)))
+    assert len(areas) == 2
+
+
+def test_kmz_without_kml_is_rejected():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("readme.txt", "not kml")
+    buffer.seek(0)
+
+    with pytest.raises(ValueError):
+        open_kml("areas.kmz", buffer)
+
+
+def test_plain_kml_stream_is_returned_as_is():
+    stream = io.BytesIO(KML)
+    assert open_kml("areas.kml", stream) is stream
+
+
+def test_self_intersecting_polygon_is_repaired():
+    bowtie = Polygon([(0, 0), (2, 2), (2, 0), (0, 2), (0, 0)])
+    repaired = as_multipolygon(bowtie)
+
+    assert repaired.is_valid
+    assert repaired.geom_type == "MultiPolygon"
+    assert repaired.area == pytest.approx(2)
@@ -0,0 +1,31 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    position = {"id": 42, "grade_value": 45.5}
+    assert decode_cursor(encode_cursor(position)) == position
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor({"id": 1})
+    assert "=" not in cursor
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "%%%", base64.urlsafe_b64encode(b"{broken").decode()])
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_cursor_must_hold_an_object():
+    cursor = base64.urlsafe_b64encode(b"[1, 2]").decode().rstrip("=")
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,100 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.models.add_climb import Climb, Hitlist, Log, Ticklist, User
+from app.tests.query_counter import QueryCounter, assert_max_queries
+
+# Enough rows that a per-row query would blow every bound below
+CLIMB_COUNT = 30
+USER_COUNT = 5
+
+
+def test_counter_records_statements():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with QueryCounter(engine) as counter:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        conn.execute(text("SELECT 3"))
+    assert counter.count == 2
+
+
+def test_assert_max_queries_lists_the_statements():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with pytest.raises(AssertionError, match="ran 2"):
+            with assert_max_queries(1, engine):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+@pytest.fixture
+def catalog(db):
+    climbs = [
+        Climb(name=f"Climb {n}", latitude=-3.0, longitude=37.0, type="Boulder", grade="V3", description="x" * 200)
+        for n in range(CLIMB_COUNT)
+    ]
+    users = [User(username=f"user{n}", email=f"user{n}@example.com", hashed_password="-") for n in range(USER_COUNT)]
+    db.add_all(climbs + users)
+    db.flush()
+    for user in users:
+        for climb in climbs:
+            db.add_all([
+                Log(user_id=user.id, climb_id=climb.id, date="2026-01-01", grade="V3", comment="ok"),
+                Ticklist(user_id=user.id, climb_id=climb.id),
+                Hitlist(user_id=user.id, climb_id=climb.id),
+            ])
+    db.commit()
+    return climbs[0].id, users[0].id
+
+
+@pytest.fixture
+def auth_headers(app_main, catalog):
+    _, user_id = catalog
+    token = app_main.create_access_token({"sub": "user0", "uid": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_climb_logs(client, catalog):
+    climb_id, _ = catalog
+    with assert_max_queries(1):
+        response = client.get(f"/climbs/{climb_id}/logs")
+    assert response.status_code == 200
+    assert len(response.json()) == USER_COUNT
+
+
+@pytest.mark.parametrize("view", ["summary", "detail"])
+def test_climbs(client, catalog, view):
+    # Versions for the ETag, then the page
+    with assert_max_queries(2):
+        response = client.get("/climbs/", params={"limit": 25, "view": view})
+    assert response.status_code == 200
+    assert len(response.json()) == 25
+
+
+def test_users(client, catalog):
+    with assert_max_queries(1):
+        response = client.get("/users/", params={"search": "user"})
+    assert response.status_code == 200
+    assert len(response.json()) == USER_COUNT
+
+    with assert_max_queries(1):
+        response = client.get("/users/", params={"usernames": "user0,user1,user2"})
+    assert len(response.json()) == 3
+
+
+def test_user_ticks(client, catalog):
+    _, user_id = catalog
+    with assert_max_queries(1):
+        response = client.get(f"/users/{user_id}/ticks")
+    assert response.status_code == 200
+    assert len(response.json()) == CLIMB_COUNT
+
+
+@pytest.mark.parametrize("path", ["/ticklist/", "/hitlist/"])
+def test_own_lists(client, auth_headers, path):
+    # The token's user lookup, then the list
+    with assert_max_queries(2):
+        response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == CLIMB_COUNT
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.pool import NullPool
+
+from app.models.add_climb import Climb, climb_tags_filter
+
+CLIMBS = {
+    "Both": "crack, slab",
+    "Crack": "crack",
+    "Slab": "Slab",
+    "Untagged": None,
+}
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), asyncpg.dialect()], ids=["psycopg2", "asyncpg"])
+@pytest.mark.parametrize("match,operator", [("any", "&&"), ("all", "@>")])
+def test_literal_is_cast_to_the_column_type(dialect, match, operator):
+    sql = str(climb_tags_filter(["CRACK", "SLAB"], match).compile(dialect=dialect))
+    assert sql.startswith(f"climbs.tag_array {operator} CAST(ARRAY[")
+    assert sql.endswith("AS TEXT[])")
+
+
+@pytest.fixture
+def tagged_climbs(db):
+    climbs = {
+        name: Climb(name=name, latitude=-3.0, longitude=37.0, type="Boulder", grade="V3", tags=tags)
+        for name, tags in CLIMBS.items()
+    }
+    db.add_all(climbs.values())
+    db.commit()
+    return {name: climb.id for name, climb in climbs.items()}
+
+
+def _names(ids, tagged_climbs):
+    by_id = {climb_id: name for name, climb_id in tagged_climbs.items()}
+    return sorted(by_id[climb_id] for climb_id in ids)
+
+
+@pytest.mark.parametrize("match,expected", [("any", ["Both", "Crack", "Slab"]), ("all", ["Both"])])
+def test_filter_with_psycopg2(db, tagged_climbs, match, expected):
+    ids = db.scalars(select(Climb.id).where(climb_tags_filter(["CRACK", "SLAB"], match))).all()
+    assert _names(ids, tagged_climbs) == expected
+
+
+@pytest.mark.parametrize("match,expected", [("any", ["Both", "Crack", "Slab"]), ("all", ["Both"])])
+def test_filter_with_asyncpg(db, tagged_climbs, match, expected):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.db.session import ASYNC_DATABASE_URL
+
+    async def query():
+        # A private engine, so its connections belong to this event loop
+        engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                result = await conn.execute(select(Climb.id).where(climb_tags_filter(["CRACK", "SLAB"], match)))
+                return result.scalars().all()
+        finally:
+            await engine.dispose()
+
+    assert _names(asyncio.run(query()), tagged_climbs) == expected
+
+
+@pytest.mark.parametrize("match,expected", [("any", ["Both", "Crack", "Slab"]), ("all", ["Both"])])
+def test_climbs_endpoint(client, tagged_climbs, match, expected):
+    response = client.get("/climbs/", params={"tags": "slab, Crack", "tags_match": match})
+    assert response.status_code == 200
+    assert _names([climb["id"] for climb in response.json()], tagged_climbs) == expected
@@ -0,0 +1,47 @@
+# ClimbTanzania/backend/app/user_lists.py
+from sqlalchemy import Integer, delete, literal, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import add_climb as models
+
+
+def add_entry(model, user_id: int, climb_id: int, **values):
+    """Single-statement insert of a (user, climb) row into a ticklist-style table.
+
+    The row is selected from ``climbs`` so a missing climb inserts nothing
+    instead of tripping the foreign key, and the unique (user_id, climb_id)
+    constraint turns a duplicate into a no-op. The statement returns the new
+    row, so an empty result means the climb is missing or already listed.
+    Values may be SQL expressions over the selected ``climbs`` row.
+    """
+    columns = ["user_id", "climb_id", *values]
+    source = select(
+        literal(user_id, Integer),
+        models.Climb.id,
+        *(
+            value if isinstance(value, ColumnElement) else literal(value, model.__table__.c[name].type)
+            for name, value in values.items()
+        ),
+    ).where(models.Climb.id == climb_id)
+    return (
+        insert(model)
+        .from_select(columns, source)
+        .on_conflict_do_nothing(index_elements=["user_id", "climb_id"])
+        .returning(*(model.__table__.c[name] for name in ["id", *columns]))
+    )
+
+
+def remove_entry(model, user_id: int, climb_id: int):
+    """Single-statement delete; an empty result means there was nothing to remove."""
+    return (
+        delete(model)
+        .where(model.user_id == user_id, model.climb_id == climb_id)
+        .returning(model.id)
+    )
+
+
+async def climb_exists(db, climb_id: int) -> bool:
+    """Only consulted after an empty ``add_entry`` to pick the right error."""
+    result = await db.execute(select(models.Climb.id).where(models.Climb.id == climb_id))
+    return result.first() is not None
@@ -0,0 +1,105 @@
+# ClimbTanzania/backend/app/versions.py
+import hashlib
+import os
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import add_climb as models
+
+CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, no-cache")
+
+
+def _bump_versions(tables):
+    stmt = insert(models.TableVersion).values(
+        [{"name": table, "version": 1, "updated_at": func.now()} for table in tables]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[models.TableVersion.name],
+        set_={"version": models.TableVersion.version + 1, "updated_at": func.now()},
+    )
+
+
+def mark_changed(db, *tables):
+    """Record a write to the given tables.
+
+    The counters live in Postgres so every worker derives the same ETag and
+    the same response cache keys, and stops serving what it built before.
+    """
+    db.execute(_bump_versions(tables))
+    db.commit()
+
+
+async def mark_changed_async(db, *tables):
+    await db.execute(_bump_versions(tables))
+    await db.commit()
+
+
+def _version_query(table: str):
+    return select(models.TableVersion.version).where(models.TableVersion.name == table)
+
+
+def table_version(db, table: str) -> int:
+    """Change counter of one table as every worker sees it, 0 before its first write."""
+    return db.scalar(_version_query(table)) or 0
+
+
+async def table_version_async(db, table: str) -> int:
+    return (await db.scalar(_version_query(table))) or 0
+
+
+class CatalogValidators:
+    """ETag and Last-Modified for a response derived from some catalog tables."""
+
+    def __init__(self, etag: str, last_modified):
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def headers(self):
+        headers = {"ETag": self.etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def apply(self, response: Response):
+        response.headers.update(self.headers)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+
+def catalog_validators(db, tables, variant: str = "") -> CatalogValidators:
+    rows = (
+        db.query(models.TableVersion.name, models.TableVersion.version, models.TableVersion.updated_at)
+        .filter(models.TableVersion.name.in_(tables))
+        .all()
+    )
+    versions = {name: (version, updated_at) for name, version, updated_at in rows}
+
+    state = ";".join(f"{table}={versions.get(table, (0, None))[0]}" for table in tables)
+    etag = '"' + hashlib.sha1(f"{state}|{variant}".encode()).hexdigest() + '"'
+    timestamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    return CatalogValidators(etag, max(timestamps) if timestamps else None)
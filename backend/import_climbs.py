@@ -0,0 +1,47 @@
+"""Import climbs from a CSV, GeoJSON or KML file.
+
+Usage: python import_climbs.py climbs.csv [--dry-run] [--batch-size 1000]
+"""
+import argparse
+import json
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.db.base import SessionLocal
+from app.importer import detect_format, import_climbs, ROW_READERS, IMPORT_BATCH_SIZE
+from app.versions import mark_changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--dry-run", action="store_true", help="validate and report without writing")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path)
+    if fmt is None:
+        parser.error("file must end in .csv, .geojson, .json, .kml or .kmz")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = import_climbs(db, ROW_READERS[fmt](stream), dry_run=args.dry_run, batch_size=args.batch_size)
+        if report["created"] and not args.dry_run:
+            # Bumps the climbs entry of table_versions, which every API worker's
+            # ETags, response cache keys and map clusters are keyed on; the
+            # home-page feed rings reload within FEED_RING_TTL_SECONDS
+            mark_changed(db, "climbs")
+    finally:
+        db.close()
+
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 1 if report["error_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,41 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from passlib.context import CryptContext
-from shapely.geometry import shape, Point
-import xmltodict
 from app.models import add_climb as models
 from app.schemas import add_climb as schemas
-from app.db.base import engine, SessionLocal
-from typing import List
+from app.db.base import engine, get_db
+from app.db.pool import pool_stats
+from app.db.session import get_async_db
+from typing import List, Union
 import logging
-from geoalchemy2.shape import to_shape
-from geoalchemy2.elements import WKBElement
-from sqlalchemy import func
+from sqlalchemy import func, select, literal, union_all, tuple_
 from datetime import date, datetime, timedelta
 from jose import JWTError, jwt
 from pydantic import EmailStr
 from app.auth import get_current_user
+from app.core.security import password_hasher
+from app.area_geometry import area_geometry_cache, detail_for_zoom
+from app.cache import response_cache, params_digest
+from app.clustering import cluster_index
+from app.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.versions import mark_changed, mark_changed_async, catalog_validators
+from app.importer import detect_format, import_climbs, ROW_READERS
+from app.user_lists import add_entry, remove_entry, climb_exists
+from app.kml import iter_kml_areas, open_kml
+from app.grades import grade_value, grade_value_for_type
+from app.serialization import ORJSONResponse, CLIMB_VIEW_PATTERN, climb_columns, climb_rows, encode, json_response
+from app.search import search_statement, like_pattern, SEARCH_KINDS, SEARCH_MAX_LIMIT, SEARCH_MAX_SKIP, MIN_QUERY_LENGTH
+from app.feed import activity_feed, record_first_ascents, tick_entry_statement, link_first_ascents_statement, tick_response, first_ascent_response
+from app.spatial import area_index, upsert_areas, reassign_all_climbs, INDEPENDENT_AREA
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Database configuration
-DATABASE_URL = os.getenv('DATABASE_URL')
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # FastAPI app initialization
 app = FastAPI()
 
@@ -49,11 +56,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2 configuration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -62,26 +67,24 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 180
 
-# Dependency to get the database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# Upper bound on climb ids accepted by the batched membership endpoint
+MAX_MEMBERSHIP_IDS = 500
 
-def get_user(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+async def get_user(db: AsyncSession, username: str):
+    result = await db.execute(select(models.User).filter(models.User.username == username))
+    return result.scalars().first()
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user(db, username)
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         return False
+    # Rehash transparently when the stored bcrypt cost differs from BCRYPT_ROUNDS
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -95,8 +98,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 @app.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -105,13 +108,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "uid": user.id}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@app.get("/users/me")
-async def read_users_me(current_user: models.User = Depends(get_current_user)):
+@app.get("/users/me", response_model=schemas.CurrentUser)
+async def read_users_me(current_user: schemas.CurrentUser = Depends(get_current_user)):
     return current_user
 
 # Initialize the database models
@@ -119,9 +122,25 @@ models.Base.metadata.create_all(bind=engine)
 
 
 @app.get("/users/", response_model=List[schemas.User])
-def get_users(search: str = '', db: Session = Depends(get_db)):
-    users = db.query(models.User).filter(models.User.username.ilike(f'%{search}%')).all()
-    return users
+def get_users(search: str = '', usernames: str = None, limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT), db: Session = Depends(get_db)):
+    # Exact lookup of the users behind a list of names, e.g. first ascensionists on screen
+    if usernames:
+        names = [name.strip() for name in usernames.split(',') if name.strip()]
+        return db.query(models.User).filter(models.User.username.in_(names)).all()
+
+    # An empty search used to return every user; now it returns nothing
+    search = search.strip()
+    if not search:
+        return []
+
+    # Substring match served by the username trigram index, closest names first
+    return (
+        db.query(models.User)
+        .filter(models.User.username.ilike(like_pattern(search), escape="\\"))
+        .order_by(func.similarity(models.User.username, search).desc(), models.User.id)
+        .limit(limit)
+        .all()
+    )
 
 
 @app.get("/users/{id}", response_model=schemas.User)
@@ -132,27 +151,26 @@ def get_user_by_id(id: int, db: Session = Depends(get_db)):
     return user
 
 
-@app.get("/users/{id}/ticks", response_model=List[schemas.Climb])
-def get_user_ticks(id: int, db: Session = Depends(get_db)):
-    ticklist_climbs = (
-        db.query(models.Climb)
+@app.get("/users/{id}/ticks", response_model=List[Union[schemas.ClimbSummary, schemas.Climb]], response_class=ORJSONResponse)
+def get_user_ticks(
+    id: int,
+    view: str = Query("summary", pattern=CLIMB_VIEW_PATTERN),
+    db: Session = Depends(get_db),
+):
+    rows = (
+        db.query(*climb_columns(view))
         .join(models.Ticklist, models.Climb.id == models.Ticklist.climb_id)
         .filter(models.Ticklist.user_id == id)
         .all()
     )
-
-    for climb in ticklist_climbs:
-        if isinstance(climb.first_ascent_date, (date, datetime)):
-            climb.first_ascent_date = climb.first_ascent_date.isoformat()
-
-    return ticklist_climbs
+    return json_response(climb_rows(rows, view))
 
 
 @app.post("/register")
 async def register(
     form_data: OAuth2PasswordRequestForm = Depends(),
     email: EmailStr = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Validate username length
     if len(form_data.username) < 3:
@@ -169,9 +187,12 @@ async def register(
         )
 
     # Check if the username or email already exists
-    existing_user = db.query(models.User).filter(
-        (models.User.username == form_data.username) | (models.User.email == email)
-    ).first()
+    result = await db.execute(
+        select(models.User).filter(
+            (models.User.username == form_data.username) | (models.User.email == email)
+        ).limit(1)
+    )
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -179,11 +200,15 @@ async def register(
         )
 
     # Create the new user
-    hashed_password = pwd_context.hash(form_data.password)
+    hashed_password = await password_hasher.hash(form_data.password)
     new_user = models.User(username=form_data.username, email=email, hashed_password=hashed_password)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
+    linked = await db.execute(link_first_ascents_statement(new_user.id, new_user.username))
+    await db.commit()
+    if linked.rowcount:
+        activity_feed.invalidate("first_ascents")
+    await mark_changed_async(db, "users")
 
     return {"msg": "User created successfully"}
 
@@ -194,22 +219,24 @@ def create_climb(climb: schemas.ClimbCreate, db: Session = Depends(get_db)):
     try:
         db_climb = models.Climb(**climb.dict())
         
-        # Determine if the climb is within any existing area
-        assigned_area = db.query(models.Area).filter(
-            func.ST_Contains(
-                func.ST_SetSRID(models.Area.polygon, 4326),
-                func.ST_SetSRID(func.ST_MakePoint(db_climb.longitude, db_climb.latitude), 4326)
-            )
-        ).first()
-
-        if assigned_area:
-            db_climb.area = assigned_area.name
-        else:
-            db_climb.area = "Independent Climbs"
+        # Determine if the climb is within any existing area using the areas.polygon GiST index
+        point = func.ST_SetSRID(func.ST_MakePoint(db_climb.longitude, db_climb.latitude), 4326)
+        assigned_area = (
+            db.query(models.Area.name)
+            .filter(func.ST_Contains(models.Area.polygon, point))
+            .order_by(models.Area.id)
+            .first()
+        )
+        db_climb.area = assigned_area.name if assigned_area else INDEPENDENT_AREA
 
         db.add(db_climb)
+        db.flush()
+        feed_entries = record_first_ascents(db, [climb.model_dump() | {"id": db_climb.id, "area": db_climb.area}])
         db.commit()
         db.refresh(db_climb)
+        for entry in feed_entries:
+            activity_feed.push(entry)
+        mark_changed(db, "climbs")
 
         # Convert first_ascent_date to string if it's a date object
         if isinstance(db_climb.first_ascent_date, (date, datetime)):
@@ -222,9 +249,45 @@ def create_climb(climb: schemas.ClimbCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=f"Error inserting climb: {e}")
 
 
-@app.get("/climbs/", response_model=List[schemas.Climb])
-def read_climbs(skip: int = 0, limit: int = 25, grades: str = None, areas: str = None, type: str = None, first_ascensionist: str = None, db: Session = Depends(get_db)):
-    query = db.query(models.Climb)
+@app.get("/climbs/", response_model=List[Union[schemas.ClimbSummary, schemas.Climb]], response_class=ORJSONResponse)
+def read_climbs(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 25,
+    cursor: str = None,
+    grades: str = None,
+    grade_min: str = None,
+    grade_max: str = None,
+    sort: str = Query("id", pattern="^(id|grade|-grade)$"),
+    tags: str = None,
+    tags_match: str = Query("any", pattern="^(any|all)$"),
+    areas: str = None,
+    type: str = None,
+    first_ascensionist: str = None,
+    view: str = Query("summary", pattern=CLIMB_VIEW_PATTERN),
+    db: Session = Depends(get_db),
+):
+    params = dict(
+        skip=skip, limit=limit, cursor=cursor, grades=grades, grade_min=grade_min, grade_max=grade_max,
+        sort=sort, tags=tags, tags_match=tags_match, areas=areas, type=type, first_ascensionist=first_ascensionist,
+        view=view,
+    )
+    validators = catalog_validators(db, ("climbs", "areas"), params_digest(("grades", "tags", "areas"), **params))
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
+
+    cache_key = response_cache.make_key("climbs.list", validators.etag, list_params=("grades", "tags", "areas"), **params)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        if cached["next_cursor"]:
+            response.headers[NEXT_CURSOR_HEADER] = cached["next_cursor"]
+        return json_response(cached["body"].encode(), response)
+
+    # Plain column tuples for the requested view, so list pages never read
+    # descriptions; grade_value trails the schema columns as the sort key
+    query = db.query(*climb_columns(view), models.Climb.grade_value)
 
     # Filter by type (e.g., Boulder)
     if type:
@@ -235,7 +298,19 @@ def read_climbs(skip: int = 0, limit: int = 25, grades: str = None, areas: str =
         grade_list = grades.split(',')
         query = query.filter(models.Climb.grade.in_(grade_list))
 
-    # Filter by area name with SRID enforcement
+    # Filter by tags, served by the GIN index on tag_array: overlap for any, containment for all
+    if tags:
+        tag_list = sorted({tag.strip().upper() for tag in tags.split(',') if tag.strip()})
+        if tag_list:
+            query = query.filter(models.climb_tags_filter(tag_list, tags_match))
+
+    # Filter by a difficulty range, served by ix_climbs_grade_value_id
+    if grade_min:
+        query = query.filter(models.Climb.grade_value >= grade_bound(grade_min, type))
+    if grade_max:
+        query = query.filter(models.Climb.grade_value <= grade_bound(grade_max, type))
+
+    # Filter by area name, served by the GiST indexes on areas.polygon and climbs.geom
     if areas:
         area_list = areas.split(',')
 
@@ -250,10 +325,7 @@ def read_climbs(skip: int = 0, limit: int = 25, grades: str = None, areas: str =
                 db.query(models.Area)
                 .filter(
                     models.Area.name.in_(area_list),
-                    func.ST_Contains(
-                        func.ST_Transform(func.ST_SetSRID(models.Area.polygon, 4326), 4326), 
-                        func.ST_SetSRID(func.ST_MakePoint(models.Climb.longitude, models.Climb.latitude), 4326)
-                    )
+                    func.ST_Contains(models.Area.polygon, models.Climb.geom)
                 )
                 .exists()
             )
@@ -262,19 +334,203 @@ def read_climbs(skip: int = 0, limit: int = 25, grades: str = None, areas: str =
     if first_ascensionist:
         query = query.filter(models.Climb.first_ascensionist == first_ascensionist)
 
-    # Apply pagination
-    climbs = query.offset(skip).limit(limit).all()
+    # Keyset pagination: a cursor seeks past the last row of the previous page
+    # through an index, so deep pages cost the same as the first. Ordering by
+    # grade walks (grade_value, id) and leaves out climbs with an unrecognised
+    # grade. skip is still honoured for callers that page by offset.
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None and not isinstance(position.get("id"), int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if sort == "id":
+        query = query.order_by(models.Climb.id)
+        if position is not None:
+            query = query.filter(models.Climb.id > position["id"])
+    else:
+        key = tuple_(models.Climb.grade_value, models.Climb.id)
+        query = query.filter(models.Climb.grade_value.isnot(None))
+        if sort == "grade":
+            query = query.order_by(models.Climb.grade_value, models.Climb.id)
+        else:
+            query = query.order_by(models.Climb.grade_value.desc(), models.Climb.id.desc())
+        if position is not None:
+            if not isinstance(position.get("grade_value"), (int, float)):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            seek = (position["grade_value"], position["id"])
+            query = query.filter(key > seek if sort == "grade" else key < seek)
+
+    if position is None and skip:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    climbs = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(climbs) > limit:
+        climbs = climbs[:limit]
+        last = {"id": climbs[-1].id}
+        if sort != "id":
+            last["grade_value"] = climbs[-1].grade_value
+        next_cursor = encode_cursor(last)
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    # Cache the encoded body (as text, for the Redis backend) so hits skip serialization too
+    body = encode(climb_rows(climbs, view))
+    response_cache.set(cache_key, {"body": body.decode(), "next_cursor": next_cursor})
+    return json_response(body, response)
+
+
+@app.get("/climbs/bbox", response_model=List[schemas.ClimbPoint])
+def read_climbs_in_bbox(
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    type: str = None,
+    grades: str = None,
+    areas: str = None,
+    limit: int = Query(5000, ge=1, le=20000),
+    db: Session = Depends(get_db)
+):
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    # && against the envelope is answered by the climbs.geom GiST index
+    envelope = func.ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)
+    query = db.query(
+        models.Climb.id,
+        models.Climb.name,
+        models.Climb.latitude,
+        models.Climb.longitude,
+        models.Climb.grade,
+        models.Climb.type,
+    ).filter(models.Climb.geom.intersects(envelope))
 
-    # Convert date fields to strings
-    for climb in climbs:
-        if isinstance(climb.first_ascent_date, (date, datetime)):
-            climb.first_ascent_date = climb.first_ascent_date.isoformat()
+    if type:
+        query = query.filter(models.Climb.type == type)
+
+    if grades:
+        query = query.filter(models.Climb.grade.in_(grades.split(',')))
+
+    # Filter by the stored area name, kept current by the area assignment
+    if areas:
+        area_list = areas.split(',')
+        in_areas = models.Climb.area.in_(area_list)
+        if INDEPENDENT_AREA in area_list:
+            in_areas = in_areas | models.Climb.area.is_(None) | (models.Climb.area == '')
+        query = query.filter(in_areas)
 
-    return climbs
+    rows = query.limit(limit).all()
+
+    return [
+        {"id": climb_id, "name": name, "lat": latitude, "lon": longitude, "grade": grade, "type": climb_type}
+        for climb_id, name, latitude, longitude, grade, climb_type in rows
+    ]
+
+
+@app.get("/climbs/clusters", response_model=List[schemas.ClimbCluster])
+def read_climb_clusters(
+    zoom: int = Query(..., ge=0, le=22),
+    min_lon: float = Query(-180, ge=-180, le=180),
+    min_lat: float = Query(-85, ge=-90, le=90),
+    max_lon: float = Query(180, ge=-180, le=180),
+    max_lat: float = Query(85, ge=-90, le=90),
+    type: str = None,
+    db: Session = Depends(get_db)
+):
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    return cluster_index.clusters(db, zoom, min_lon, min_lat, max_lon, max_lat, climb_type=type)
+
+
+@app.get("/climbs/membership", response_model=List[schemas.ClimbMembership])
+async def get_climb_membership(climb_ids: str, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
+    try:
+        ids = list(dict.fromkeys(int(climb_id) for climb_id in climb_ids.split(',') if climb_id.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="climb_ids must be a comma-separated list of integers")
+    if len(ids) > MAX_MEMBERSHIP_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_MEMBERSHIP_IDS} climb ids can be requested at once")
+    if not ids:
+        return []
+
+    # One statement, each branch an index range scan on (user_id, climb_id)
+    membership = union_all(
+        select(literal("ticked"), models.Ticklist.climb_id)
+        .where(models.Ticklist.user_id == current_user.id, models.Ticklist.climb_id.in_(ids)),
+        select(literal("hitlisted"), models.Hitlist.climb_id)
+        .where(models.Hitlist.user_id == current_user.id, models.Hitlist.climb_id.in_(ids)),
+        select(literal("logged"), models.Log.climb_id)
+        .where(models.Log.user_id == current_user.id, models.Log.climb_id.in_(ids)),
+    )
+    result = await db.execute(membership)
+
+    states = {climb_id: {"climb_id": climb_id, "ticked": False, "hitlisted": False, "logged": False} for climb_id in ids}
+    for kind, climb_id in result.all():
+        states[climb_id][kind] = True
+    return list(states.values())
+
+
+@app.get("/climbs/tags", response_model=List[schemas.TagCount])
+def get_climb_tags(request: Request, response: Response, type: str = None, db: Session = Depends(get_db)):
+    validators = catalog_validators(db, ("climbs",), params_digest(type=type))
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
+
+    cache_key = response_cache.make_key("climbs.tags", validators.etag, type=type)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    tag = func.unnest(models.Climb.tag_array).label("tag")
+    query = db.query(tag, func.count().label("count"))
+    if type:
+        query = query.filter(models.Climb.type == type)
+    rows = query.group_by("tag").order_by(func.count().desc(), "tag").all()
+
+    result = [{"tag": row.tag, "count": row.count} for row in rows]
+    response_cache.set(cache_key, result)
+    return result
+
+
+@app.get("/search", response_model=List[schemas.SearchResult])
+def search(
+    q: str,
+    kind: str = Query(None, pattern="^(climb|user)$"),
+    skip: int = Query(0, ge=0, le=SEARCH_MAX_SKIP),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    db: Session = Depends(get_db),
+):
+    q = q.strip()
+    if len(q) < MIN_QUERY_LENGTH:
+        return []
+
+    kinds = (kind,) if kind else SEARCH_KINDS
+    version = catalog_validators(db, ("climbs", "users")).etag
+    cache_key = response_cache.make_key("search", version, q=q.lower(), kind=kind, skip=skip, limit=limit)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(search_statement(q, kinds=kinds, limit=limit, skip=skip)).mappings()
+    result = [dict(row) for row in rows]
+    response_cache.set(cache_key, result)
+    return result
 
 
 @app.get("/climbs/{id}", response_model=schemas.Climb)
-def read_climb(id: int, db: Session = Depends(get_db)):
+def read_climb(id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    validators = catalog_validators(db, ("climbs",), f"climb:{id}")
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
+
+    cache_key = response_cache.make_key("climbs.detail", validators.etag, id=id)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         climb = db.query(models.Climb).filter(models.Climb.id == id).first()
         if climb is None:
@@ -284,56 +540,81 @@ def read_climb(id: int, db: Session = Depends(get_db)):
         if isinstance(climb.first_ascent_date, (date, datetime)):
             climb.first_ascent_date = climb.first_ascent_date.isoformat()
 
-        return climb
+        result = schemas.Climb.model_validate(climb).model_dump()
+        response_cache.set(cache_key, result)
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error reading climb with id {id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error reading climb with id {id}: {e}")
 
 
-# KML Upload and Area Assignment
+# Bulk climb import from CSV, GeoJSON or KML
+@app.post("/climbs/import")
+def import_climbs_file(file: UploadFile = File(...), dry_run: bool = False, db: Session = Depends(get_db)):
+    fmt = detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Invalid file format. Please upload a CSV, GeoJSON or KML file.")
+
+    try:
+        report = import_climbs(db, ROW_READERS[fmt](file.file), dry_run=dry_run)
+    except Exception as e:
+        logger.error(f"Error importing {file.filename}: {e}")
+        raise HTTPException(status_code=400, detail=f"Could not read {file.filename}: {e}")
+
+    if report["created"] and not dry_run:
+        mark_changed(db, "climbs")
+
+    return {"filename": file.filename, **report}
+
+
+# KML/KMZ Upload and Area Assignment
 @app.post("/upload_kml")
-async def upload_kml(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    if not file.filename.endswith('.kml'):
-        raise HTTPException(status_code=400, detail="Invalid file format. Please upload a KML file.")
-    
-    contents = await file.read()
-    kml_data = xmltodict.parse(contents)
-    coordinates_str = kml_data['kml']['Document']['Placemark']['Polygon']['outerBoundaryIs']['LinearRing']['coordinates']
-
-    # Process coordinates
-    coords = []
-    for point in coordinates_str.strip().split():
-        try:
-            lon, lat, _ = map(float, point.split(","))
-            coords.append([lon, lat])
-        except ValueError as e:
-            logger.error(f"Invalid coordinate value: {point} - {e}")
-
-    if not coords:
-        raise HTTPException(status_code=400, detail="No valid coordinates found in the KML file.")
-    
-    polygon = shape({"type": "Polygon", "coordinates": [coords]})
+async def upload_kml(
+    file: UploadFile = File(...),
+    mode: str = Query("replace", pattern="^(replace|merge)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not file.filename.lower().endswith(('.kml', '.kmz')):
+        raise HTTPException(status_code=400, detail="Invalid file format. Please upload a KML or KMZ file.")
 
-    # Ensure SRID is set to 4326
-    new_area = models.Area(name=file.filename, polygon=from_shape(polygon, srid=4326))
-    db.add(new_area)
-    db.commit()
+    # Parsing is CPU bound, keep it off the event loop
+    default_name = os.path.splitext(file.filename)[0]
+    try:
+        areas = await run_in_threadpool(
+            lambda: list(iter_kml_areas(open_kml(file.filename, file.file), default_name=default_name))
+        )
+    except Exception as e:
+        logger.error(f"Error parsing {file.filename}: {e}")
+        raise HTTPException(status_code=400, detail=f"Could not read {file.filename}: {e}")
+
+    if not areas:
+        raise HTTPException(status_code=400, detail="No valid polygons found in the KML file.")
 
-    # Assign climbs to area
-    assign_climbs_to_area(new_area, db)
+    actions, assigned = await upsert_areas(db, areas, mode=mode)
+    await mark_changed_async(db, "climbs")
 
-    return {"filename": file.filename}
+    return {"filename": file.filename, "areas": actions, "assigned_climbs": assigned}
 
 
 @app.get("/areas/", response_model=List[schemas.Area])
-def get_areas(db: Session = Depends(get_db)):
+def get_areas(request: Request, response: Response, db: Session = Depends(get_db)):
+    validators = catalog_validators(db, ("areas",))
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
+
+    cache_key = response_cache.make_key("areas.list", validators.etag)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     areas = db.query(
         models.Area.id,
         models.Area.name,
         func.ST_AsText(models.Area.polygon).label('polygon')
     ).all()
-    
-    print(f"Queried areas with WKT: {areas}")
 
     # Convert the queried data into the desired structure
     polygons = [
@@ -341,172 +622,181 @@ def get_areas(db: Session = Depends(get_db)):
         for area in areas
     ]
 
-    print(f"Final polygons list: {polygons}")
+    response_cache.set(cache_key, polygons)
     return polygons
 
 
+@app.get("/areas/geojson")
+def get_areas_geojson(
+    request: Request,
+    detail: str = Query(None, pattern="^(full|medium|coarse)$"),
+    zoom: int = Query(None, ge=0, le=22),
+    db: Session = Depends(get_db)
+):
+    detail = detail or detail_for_zoom(zoom)
+    validators = catalog_validators(db, ("areas",), f"geojson:{detail}")
+    if validators.matches(request):
+        return validators.not_modified()
+
+    raw, compressed = area_geometry_cache.payload(db, detail, validators.etag)
+    headers = {**validators.headers, "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=compressed, media_type="application/geo+json", headers=headers)
+    return Response(content=raw, media_type="application/geo+json", headers=headers)
+
+
 @app.post("/assign_existing_climbs/")
-def assign_existing_climbs(db: Session = Depends(get_db)):
-    climbs = db.query(models.Climb).all()
-    areas = db.query(models.Area).all()
-
-    for climb in climbs:
-        point = Point(climb.longitude, climb.latitude)
-        assigned = False
-
-        for area in areas:
-            try:
-                # Ensure polygon is correctly parsed from WKB
-                if isinstance(area.polygon, WKBElement):
-                    polygon = to_shape(area.polygon)  # Using geoalchemy2's to_shape for safer conversion
-                else:
-                    continue  # Skip if the polygon is not valid
-
-                if point.within(polygon):
-                    climb.area = area.name
-                    db.commit()
-                    assigned = True
-                    break
-            except Exception as e:
-                logger.error(f"Error processing area '{area.name}' for climb '{climb.name}': {e}")
-                continue
-
-        if not assigned:
-            climb.area = "Independent Climbs"
-            db.commit()
-
-    return {"status": "success", "message": "Climbs have been assigned to areas."}
+def assign_existing_climbs(dry_run: bool = False, db: Session = Depends(get_db)):
+    try:
+        result = reassign_all_climbs(db, dry_run=dry_run)
+        if not dry_run:
+            mark_changed(db, "climbs")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error reassigning climbs to areas: {e}")
+        raise HTTPException(status_code=500, detail=f"Error reassigning climbs to areas: {e}")
+
+    message = "Dry run, no climbs were changed." if dry_run else "Climbs have been assigned to areas."
+    return {"status": "success", "message": message, **result}
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    return response_cache.stats()
+
+
+@app.get("/db/pool/stats")
+def get_db_pool_stats():
+    return pool_stats()
+
+
+@app.get("/password_hashing/stats")
+def get_password_hashing_stats():
+    return password_hasher.metrics()
 
 
 @app.post("/ticklist/add")
-async def add_to_ticklist(request: schemas.ClimbIDRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def add_to_ticklist(request: schemas.ClimbIDRequest, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        climb = db.query(models.Climb).filter(models.Climb.id == request.climb_id).first()
-        if not climb:
-            raise HTTPException(status_code=404, detail="Climb not found")
-        
-        # Check if the climb is already in the user's ticklist
-        existing_entry = db.query(models.Ticklist).filter(models.Ticklist.user_id == current_user.id, models.Ticklist.climb_id == climb.id).first()
-        if existing_entry:
+        result = await db.execute(add_entry(models.Ticklist, current_user.id, request.climb_id))
+        added = result.first()
+        await db.commit()
+        if added is None:
+            if not await climb_exists(db, request.climb_id):
+                raise HTTPException(status_code=404, detail="Climb not found")
             raise HTTPException(status_code=400, detail="Climb already in ticklist")
-        
-        # Add the climb to the user's ticklist
-        new_entry = models.Ticklist(user_id=current_user.id, climb_id=climb.id)
-        db.add(new_entry)
-        db.commit()
-        
+
         return {"msg": "Climb added to ticklist"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/ticklist/remove")
-async def remove_from_ticklist(request: schemas.ClimbIDRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def remove_from_ticklist(request: schemas.ClimbIDRequest, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        climb = db.query(models.Climb).filter(models.Climb.id == request.climb_id).first()
-        if not climb:
-            raise HTTPException(status_code=404, detail="Climb not found")
-        
-        # Check if the climb is in the user's ticklist
-        existing_entry = db.query(models.Ticklist).filter(models.Ticklist.user_id == current_user.id, models.Ticklist.climb_id == climb.id).first()
-        if not existing_entry:
+        result = await db.execute(remove_entry(models.Ticklist, current_user.id, request.climb_id))
+        removed = result.first()
+        await db.commit()
+        if removed is None:
             raise HTTPException(status_code=400, detail="Climb not in ticklist")
-        
-        # Remove the climb from the user's ticklist
-        db.delete(existing_entry)
-        db.commit()
-        
+
         return {"msg": "Climb removed from ticklist"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/ticklist/", response_model=List[schemas.Climb])
-def get_ticklist(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    ticklist_climbs = (
-        db.query(models.Climb)
+@app.get("/ticklist/", response_model=List[Union[schemas.ClimbSummary, schemas.Climb]], response_class=ORJSONResponse)
+def get_ticklist(
+    view: str = Query("summary", pattern=CLIMB_VIEW_PATTERN),
+    current_user: schemas.CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    rows = (
+        db.query(*climb_columns(view))
         .join(models.Ticklist, models.Climb.id == models.Ticklist.climb_id)
         .filter(models.Ticklist.user_id == current_user.id)
         .all()
     )
-
-
-    for climb in ticklist_climbs:
-        if isinstance(climb.first_ascent_date, (date, datetime)):
-            climb.first_ascent_date = climb.first_ascent_date.isoformat()
-
-    return ticklist_climbs
+    return json_response(climb_rows(rows, view))
 
 
 @app.post("/logs/")
-async def create_log(log: schemas.LogCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    new_log = models.Log(
-        user_id=current_user.id,
-        climb_id=log.climb_id,
-        date=log.date,
-        grade=log.grade,
-        comment=log.comment,
+async def create_log(log: schemas.LogCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
+    result = await db.execute(
+        add_entry(
+            models.Log, current_user.id, log.climb_id,
+            date=log.date, grade=log.grade, grade_value=grade_value_for_type(log.grade, models.Climb.type), comment=log.comment,
+        )
     )
-    db.add(new_log)
-    db.commit()
-    db.refresh(new_log)
-    return new_log
+    new_log = result.first()
+    feed_entry = await record_tick(db, new_log, current_user.username)
+    await db.commit()
+    if new_log is None:
+        if not await climb_exists(db, log.climb_id):
+            raise HTTPException(status_code=404, detail="Climb not found")
+        raise HTTPException(status_code=400, detail="Log for this climb already exists")
+    activity_feed.push(feed_entry)
+    await mark_changed_async(db, "logs")
+    return dict(new_log._mapping)
 
 
 @app.post("/logs/add")
-async def add_log(request: schemas.LogCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def add_log(request: schemas.LogCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        climb = db.query(models.Climb).filter(models.Climb.id == request.climb_id).first()
-        if not climb:
-            raise HTTPException(status_code=404, detail="Climb not found")
-
-        # Check if a log for this climb already exists for the user
-        existing_log = db.query(models.Log).filter(
-            models.Log.user_id == current_user.id,
-            models.Log.climb_id == climb.id
-        ).first()
-        if existing_log:
-            raise HTTPException(status_code=400, detail="Log for this climb already exists")
-
-        # Add the log to the user's logs
-        new_log = models.Log(
-            user_id=current_user.id,
-            climb_id=climb.id,
-            date=request.date,
-            grade=request.grade,
-            comment=request.comment
+        result = await db.execute(
+            add_entry(
+                models.Log, current_user.id, request.climb_id,
+                date=request.date, grade=request.grade, grade_value=grade_value_for_type(request.grade, models.Climb.type), comment=request.comment,
+            )
         )
-        db.add(new_log)
-        db.commit()
+        added = result.first()
+        feed_entry = await record_tick(db, added, current_user.username)
+        await db.commit()
+        if added is None:
+            if not await climb_exists(db, request.climb_id):
+                raise HTTPException(status_code=404, detail="Climb not found")
+            raise HTTPException(status_code=400, detail="Log for this climb already exists")
+        activity_feed.push(feed_entry)
+        await mark_changed_async(db, "logs")
 
         return {"msg": "Log added successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/logs/remove")
-async def remove_log(request: schemas.ClimbIDRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def remove_log(request: schemas.ClimbIDRequest, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        log = db.query(models.Log).filter(models.Log.user_id == current_user.id, models.Log.climb_id == request.climb_id).first()
-        
+        result = await db.execute(remove_entry(models.Log, current_user.id, request.climb_id))
+        log = result.first()
+        await db.commit()
         if log:
-            db.delete(log)
-            db.commit()
+            # The feed row goes with the log through ON DELETE CASCADE
+            activity_feed.invalidate("recent", "big_ticks")
+            await mark_changed_async(db, "logs")
 
         return {"msg": "Log removed successfully" if log else "Log not found, but no error since it might not have been logged"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-
 @app.get("/climbs/{id}/logs", response_model=List[schemas.LogWithUser])
-async def get_climb_logs(id: int, db: Session = Depends(get_db)):
-    logs = (
-        db.query(models.Log, models.User.username)
+async def get_climb_logs(id: int, db: AsyncSession = Depends(get_async_db)):
+    # Climb columns are joined in: a lazy log.climb load cannot run on an async session
+    result = await db.execute(
+        select(models.Log, models.User.username, models.Climb.name, models.Climb.type)
         .join(models.User, models.Log.user_id == models.User.id)
+        .join(models.Climb, models.Log.climb_id == models.Climb.id)
         .filter(models.Log.climb_id == id)
-        .all()
     )
+    logs = result.all()
 
     return [
         schemas.LogWithUser(
@@ -517,64 +807,22 @@ async def get_climb_logs(id: int, db: Session = Depends(get_db)):
             comment=log.comment,
             user_id=log.user_id,
             username=username,  # Access the username directly from the query result tuple
-            name=log.climb.name,  # Assuming the climb name is fetched with the log
-            type=log.climb.type  # Assuming the climb type is fetched with the log
+            name=climb_name,
+            type=climb_type
         )
-        for log, username in logs  # Unpack the tuple correctly
+        for log, username, climb_name, climb_type in logs  # Unpack the tuple correctly
     ]
 
 
 @app.get("/logs/recent", response_model=List[schemas.LogWithUser])
 def get_recent_ticks(limit: int = 10, db: Session = Depends(get_db)):
-    recent_ticks = (
-        db.query(models.Log, models.User.username, models.Climb.name, models.Climb.type)
-        .join(models.User, models.Log.user_id == models.User.id)
-        .join(models.Climb, models.Log.climb_id == models.Climb.id)
-        .order_by(models.Log.date.desc())
-        .limit(limit)
-        .all()
-    )
-
-    return [
-        schemas.LogWithUser(
-            id=log.id,
-            climb_id=log.climb_id,
-            date=log.date,
-            grade=log.grade,
-            comment=log.comment,
-            user_id=log.user_id,
-            username=username,  # Access the username directly from the tuple
-            name=climb_name,  # Access the climb name directly from the tuple
-            type=climb_type   # Access the climb type directly from the tuple
-        )
-        for log, username, climb_name, climb_type in recent_ticks
-    ]
+    return [tick_response(entry) for entry in activity_feed.read(db, "recent", limit)]
 
 
 @app.get("/climbs/recent/first-ascents", response_model=List[schemas.ClimbWithUser])
 def get_recent_first_ascents(limit: int = 5, db: Session = Depends(get_db)):
     try:
-        recent_first_ascents = (
-            db.query(models.Climb, models.User.username, models.User.id)
-            .join(models.User, models.Climb.first_ascensionist == models.User.username)
-            .filter(models.Climb.first_ascensionist.isnot(None))
-            .order_by(models.Climb.first_ascent_date.desc())
-            .limit(limit)
-            .all()
-        )
-
-        return [
-            schemas.ClimbWithUser(
-                id=climb.id,
-                name=climb.name,
-                grade=climb.grade,
-                first_ascent_date=climb.first_ascent_date.isoformat() if isinstance(climb.first_ascent_date, (date, datetime)) else climb.first_ascent_date,
-                type=climb.type,
-                username=username,
-                user_id=user_id
-            )
-            for climb, username, user_id in recent_first_ascents
-        ]
+        return [first_ascent_response(entry) for entry in activity_feed.read(db, "first_ascents", limit)]
     except Exception as e:
         logger.error(f"Error fetching recent first ascents: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -582,135 +830,75 @@ def get_recent_first_ascents(limit: int = 5, db: Session = Depends(get_db)):
 
 @app.get("/logs/recent_big_ticks", response_model=List[schemas.LogWithUser])
 def get_recent_big_ticks(limit: int = 5, db: Session = Depends(get_db)):
-    big_ticks = (
-        db.query(models.Log, models.User.username, models.Climb.name, models.Climb.type)
-        .join(models.User, models.Log.user_id == models.User.id)
-        .join(models.Climb, models.Log.climb_id == models.Climb.id)
-        .filter(
-            (models.Log.grade.ilike('V9%')) |
-            (models.Log.grade.ilike('V10%')) |
-            (models.Log.grade.ilike('V11%')) |
-            (models.Log.grade.ilike('V12%')) |
-            (models.Log.grade.ilike('V13%')) |
-            (models.Log.grade.ilike('V14%')) |
-            (models.Log.grade.ilike('V15%')) |
-            (models.Log.grade.ilike('V16%')) |
-            (models.Log.grade.ilike('V17%')) |
-            (models.Log.grade.ilike('8b%')) | 
-            (models.Log.grade.ilike('8b+%')) | 
-            (models.Log.grade.ilike('8c%')) | 
-            (models.Log.grade.ilike('8c+%')) |
-            (models.Log.grade.ilike('9a%')) | 
-            (models.Log.grade.ilike('9a+%')) | 
-            (models.Log.grade.ilike('9b%')) | 
-            (models.Log.grade.ilike('9b+%')) | 
-            (models.Log.grade.ilike('9c%'))
-        )
-        .order_by(models.Log.date.desc())
-        .limit(limit)
-        .all()
-    )
-
-    return [
-        schemas.LogWithUser(
-            id=log.id,
-            climb_id=log.climb_id,
-            date=log.date,
-            grade=log.grade,
-            comment=log.comment,
-            user_id=log.user_id,
-            username=username,
-            name=climb_name,
-            type=climb_type
-        )
-        for log, username, climb_name, climb_type in big_ticks
-    ]
+    return [tick_response(entry) for entry in activity_feed.read(db, "big_ticks", limit)]
 
 
 @app.post("/hitlist/add")
-async def add_to_hitlist(request: schemas.HitListCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def add_to_hitlist(request: schemas.HitListCreate, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        climb = db.query(models.Climb).filter(models.Climb.id == request.climb_id).first()
-        if not climb:
-            raise HTTPException(status_code=404, detail="Climb not found")
-        
-        # Check if the climb is already in the user's hitlist
-        existing_entry = db.query(models.Hitlist).filter(models.Hitlist.user_id == current_user.id, models.Hitlist.climb_id == climb.id).first()
-        if existing_entry:
+        result = await db.execute(add_entry(models.Hitlist, current_user.id, request.climb_id))
+        added = result.first()
+        await db.commit()
+        if added is None:
+            if not await climb_exists(db, request.climb_id):
+                raise HTTPException(status_code=404, detail="Climb not found")
             raise HTTPException(status_code=400, detail="Climb already in hitlist")
-        
-        # Add the climb to the user's hitlist
-        new_entry = models.Hitlist(user_id=current_user.id, climb_id=climb.id)
-        db.add(new_entry)
-        db.commit()
-        
+
         return {"msg": "Climb added to hitlist"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/hitlist/remove")
-async def remove_from_hitlist(request: schemas.ClimbIDRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def remove_from_hitlist(request: schemas.ClimbIDRequest, db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(get_current_user)):
     try:
-        climb = db.query(models.Climb).filter(models.Climb.id == request.climb_id).first()
-        if not climb:
-            raise HTTPException(status_code=404, detail="Climb not found")
-        
-        # Check if the climb is in the user's hitlist
-        existing_entry = db.query(models.Hitlist).filter(models.Hitlist.user_id == current_user.id, models.Hitlist.climb_id == climb.id).first()
-        if not existing_entry:
+        result = await db.execute(remove_entry(models.Hitlist, current_user.id, request.climb_id))
+        removed = result.first()
+        await db.commit()
+        if removed is None:
             raise HTTPException(status_code=400, detail="Climb not in hitlist")
-        
-        # Remove the climb from the user's hitlist
-        db.delete(existing_entry)
-        db.commit()
-        
+
         return {"msg": "Climb removed from hitlist"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/hitlist/", response_model=List[schemas.Climb])
-def get_hitlist(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    hitlist_climbs = (
-        db.query(models.Climb)
+@app.get("/hitlist/", response_model=List[Union[schemas.ClimbSummary, schemas.Climb]], response_class=ORJSONResponse)
+def get_hitlist(
+    view: str = Query("summary", pattern=CLIMB_VIEW_PATTERN),
+    current_user: schemas.CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    rows = (
+        db.query(*climb_columns(view))
         .join(models.Hitlist, models.Climb.id == models.Hitlist.climb_id)
         .filter(models.Hitlist.user_id == current_user.id)
         .all()
     )
-
-    for climb in hitlist_climbs:
-        if isinstance(climb.first_ascent_date, (date, datetime)):
-            climb.first_ascent_date = climb.first_ascent_date.isoformat()
-
-    return hitlist_climbs
+    return json_response(climb_rows(rows, view))
 
 
-def assign_climbs_to_area(area, db):
-    climbs = db.query(models.Climb).all()
-    for climb in climbs:
-        point = Point(climb.longitude, climb.latitude)
-        polygon = shape(load_wkt(area.polygon))
+def grade_bound(grade, climb_type=None):
+    value = grade_value(grade, climb_type)
+    if value is None:
+        raise HTTPException(status_code=400, detail=f"Unrecognised grade: {grade}")
+    return value
 
-        if polygon.contains(point):
-            climb.area = area.name
-            db.commit()
+async def record_tick(db, log, username):
+    """Write the feed row for a log returned by ``add_entry``; None if nothing was logged."""
+    if log is None:
+        return None
+    result = await db.execute(tick_entry_statement(log, username))
+    return dict(result.mappings().one())
 
 def assign_climb_to_area(climb, db):
-    areas = db.query(models.Area).all()
-    for area in areas:
-        polygon = shape(load_wkt(area.polygon))
-        point = Point(climb.longitude, climb.latitude)
-
-        if polygon.contains(point):
-            climb.area = area.name
-            db.commit()
-            break
-
-    # Assign to "Independent Climbs" if no other area matched
-    if not climb.area:
-        climb.area = "Independent Climbs"
-        db.commit()
+    area_index.ensure_loaded(db)
+    climb.area = area_index.area_name_for(climb.longitude, climb.latitude)
+    db.commit()
 
 # Extend Climb model to handle dict conversion
 def to_dict(self):
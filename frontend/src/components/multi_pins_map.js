@@ -1,5 +1,5 @@
-import React from 'react';
-import { MapContainer, TileLayer, Marker, Popup, Polygon } from 'react-leaflet';
+import React, { useEffect } from 'react';
+import { MapContainer, TileLayer, Marker, Popup, Polygon, useMap, useMapEvents } from 'react-leaflet';
 import MarkerClusterGroup from '../custom-modules/react-leaflet-cluster/lib'; // Ensure this path is correct
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css'; // Import leaflet CSS here if not already imported globally
@@ -13,7 +13,52 @@ const customIcon = L.icon({
   popupAnchor: [0, -44], // Popup from the top-center
 });
 
-const LeafletMap = ({ pins = [], polygons = [], initialPosition }) => {
+// Visible bounds (clamped to what the API accepts) and zoom of the map
+const viewportOf = map => {
+  const bounds = map.getBounds();
+  return {
+    minLon: Math.max(bounds.getWest(), -180),
+    minLat: Math.max(bounds.getSouth(), -90),
+    maxLon: Math.min(bounds.getEast(), 180),
+    maxLat: Math.min(bounds.getNorth(), 90),
+    zoom: map.getZoom(),
+  };
+};
+
+// Reports the viewport once the map is ready and after every pan or zoom
+const ViewportListener = ({ onViewportChange }) => {
+  const map = useMapEvents({
+    moveend: () => onViewportChange(viewportOf(map)),
+  });
+
+  useEffect(() => {
+    onViewportChange(viewportOf(map));
+  }, [map]);
+
+  return null;
+};
+
+// A server-side cluster; clicking it zooms in until its climbs separate
+const ClusterMarker = ({ cluster }) => {
+  const map = useMap();
+  const icon = L.divIcon({
+    html: `<div style="background: rgba(0, 0, 0, 0.7); color: white; border-radius: 50%; width: 32px; height: 32px; line-height: 32px; text-align: center; font-weight: bold;">${cluster.count}</div>`,
+    className: '',
+    iconSize: [32, 32],
+  });
+
+  return (
+    <Marker
+      position={[cluster.lat, cluster.lon]}
+      icon={icon}
+      eventHandlers={{
+        click: () => map.setView([cluster.lat, cluster.lon], map.getZoom() + 2),
+      }}
+    />
+  );
+};
+
+const LeafletMap = ({ pins = [], clusters = [], polygons = [], initialPosition, onViewportChange }) => {
   console.log('Polygons passed to LeafletMap:', polygons);
   return (
     <MapContainer center={initialPosition || [-2.031246, 33.496643]} zoom={8} style={{ height: '500px', width: '75vw' }}>
@@ -21,6 +66,7 @@ const LeafletMap = ({ pins = [], polygons = [], initialPosition }) => {
         url="https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}"
         attribution='&copy; <a href="https://www.esri.com/en-us/home">Esri</a> contributors'
       />
+      {onViewportChange && <ViewportListener onViewportChange={onViewportChange} />}
       <MarkerClusterGroup maxClusterRadius={10}>
         {pins.map((pin, index) => (
           <Marker key={index} position={pin.position} icon={customIcon}>
@@ -33,6 +79,9 @@ const LeafletMap = ({ pins = [], polygons = [], initialPosition }) => {
           </Marker>
         ))}
       </MarkerClusterGroup>
+      {clusters.map(cluster => (
+        <ClusterMarker key={`${cluster.lat},${cluster.lon}`} cluster={cluster} />
+      ))}
 
       {/* Render dynamic polygons */}
       {polygons.map((polygon, idx) => (
@@ -3,77 +3,85 @@ import axios from 'axios';
 import dynamic from 'next/dynamic';
 import MapFilters from '../components/map_filters';
 import climbsStyles from '../styles/climbs.module.css';
-import * as wellknown from 'wellknown';
+import { detailForZoom, toLeafletPath } from '../utils/area_path';
+import { fetchMapClimbs } from '../utils/map_climbs';
 import withAuth from '../hoc/withAuth';
 
 const LeafletMap = dynamic(() => import('../components/multi_pins_map'), { ssr: false });
 
-const BoulderMap = ({ initialClimbs, initialSelectedGrades, initialSelectedAreas }) => {
-  const [climbs, setClimbs] = useState(initialClimbs);
+const BoulderMap = ({ initialSelectedGrades = [], initialSelectedAreas = [] }) => {
+  const [climbs, setClimbs] = useState([]);
+  const [clusters, setClusters] = useState([]);
   const [selectedGrades, setSelectedGrades] = useState(initialSelectedGrades);
   const [selectedAreas, setSelectedAreas] = useState(initialSelectedAreas);
   const [polygons, setPolygons] = useState([]);
+  const [viewport, setViewport] = useState(null);
+
+  // Area outlines come pre-simplified for the zoom; only a change of detail level refetches them
+  const detail = viewport ? detailForZoom(viewport.zoom) : null;
 
   useEffect(() => {
+    if (!detail) {
+      return;
+    }
     const fetchPolygons = async () => {
       try {
-        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/areas/`);
-        console.log('Raw areas data:', response.data);  // Log the raw response
-
-        const parsedPolygons = response.data
-          .filter(polygon => polygon.polygon)
-          .map(polygon => {
-            const parsed = wellknown.parse(polygon.polygon);
-            console.log('Parsed polygon:', parsed);  // Log the parsed polygon
-
-            const invertedCoordinates = parsed.coordinates[0].map(coord => [coord[1], coord[0]]); // Invert lat/lng
-
-            return {
-              ...polygon,
-              path: invertedCoordinates,  // Use inverted coordinates
-              color: 'black',
-            };
-          });
-
-        console.log('Parsed polygons:', parsedPolygons);  // Log the final parsed polygons
+        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/areas/geojson`, {
+          params: { detail },
+        });
+        const parsedPolygons = response.data.features.map(feature => ({
+          id: feature.id,
+          name: feature.properties.name,
+          path: toLeafletPath(feature.geometry),
+          color: 'black',
+        }));
         setPolygons(parsedPolygons);
       } catch (error) {
         console.error('Error fetching polygons:', error);
       }
     };
     fetchPolygons();
-  }, []);
+  }, [detail]);
 
-  const applyFilters = async (selectedGrades, selectedAreas) => {
-    try {
-      const areasToQuery = selectedAreas.includes("Independent") ? [...selectedAreas] : selectedAreas;
-
-      const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/`, {
-        params: {
-          type: 'Boulder',
-          grades: selectedGrades.join(','),
-          areas: areasToQuery.join(','),  // Pass selected areas to backend
+  // Load only the climbs inside the visible part of the map, clustered when zoomed out
+  useEffect(() => {
+    if (!viewport) {
+      return;
+    }
+    let ignore = false;
+    const fetchClimbs = async () => {
+      try {
+        const result = await fetchMapClimbs('Boulder', viewport, selectedGrades, selectedAreas);
+        // A later pan may already have replaced this viewport
+        if (!ignore) {
+          setClimbs(result.climbs);
+          setClusters(result.clusters);
         }
-      });
+      } catch (error) {
+        console.error('Error fetching climbs:', error);
+      }
+    };
 
-      setClimbs(response.data);
-      setSelectedGrades(selectedGrades);
-      setSelectedAreas(selectedAreas);
-    } catch (error) {
-      console.error('Error fetching filtered climbs:', error);
-    }
+    fetchClimbs();
+    return () => {
+      ignore = true;
+    };
+  }, [viewport, selectedGrades, selectedAreas]);
+
+  const applyFilters = (selectedGrades, selectedAreas) => {
+    setSelectedGrades(selectedGrades);
+    setSelectedAreas(selectedAreas);
   };
 
   // Filter polygons based on selected areas
   const filteredPolygons = polygons.filter(polygon => selectedAreas.includes(polygon.name));
 
-  const pins = climbs?.map(climb => ({
-    position: [climb.latitude, climb.longitude],
+  const pins = climbs.map(climb => ({
+    position: [climb.lat, climb.lon],
     name: climb.name,
     grade: climb.grade,
     id: climb.id,
-    area: climb.area,
-  })) || [];
+  }));
 
   return (
     <div className={climbsStyles.container}>
@@ -88,36 +96,10 @@ const BoulderMap = ({ initialClimbs, initialSelectedGrades, initialSelectedAreas
           ]}
           areas={[...polygons, { name: 'Independent Climbs', id: 'independent', path: [], color: 'red' }]} // Add "Uncontained Climbs" as an option
         />
-        <LeafletMap pins={pins} polygons={filteredPolygons} />
+        <LeafletMap pins={pins} clusters={clusters} polygons={filteredPolygons} onViewportChange={setViewport} />
       </div>
     </div>
   );
 };
 
-export async function getServerSideProps() {
-  try {
-    const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/`, {
-      params: {
-        type: 'Boulder'
-      }
-    });
-    return {
-      props: {
-        initialClimbs: response.data,
-        initialSelectedGrades: [],
-        initialSelectedAreas: [],  // Initialize with no areas selected
-      }
-    };
-  } catch (error) {
-    console.error('Error fetching initial climbs:', error);
-    return {
-      props: {
-        initialClimbs: [],
-        initialSelectedGrades: [],
-        initialSelectedAreas: [],
-      }
-    };
-  }
-}
-
 export default withAuth(BoulderMap);
@@ -5,6 +5,7 @@ import MapFilters from '../components/climb_index_filters';
 import styles from '../styles/climbs.module.css';
 import withAuth from '../hoc/withAuth';
 import * as wellknown from 'wellknown';
+import { toLeafletPath } from '../utils/area_path';
 
 const Climbs = ({ initialClimbs, initialPage }) => {
   const [climbs, setClimbs] = useState(initialClimbs);
@@ -22,7 +23,7 @@ const Climbs = ({ initialClimbs, initialPage }) => {
           .filter(area => area.polygon)
           .map(area => {
             const parsed = wellknown.parse(area.polygon);
-            const invertedCoordinates = parsed.coordinates[0].map(coord => [coord[1], coord[0]]);
+            const invertedCoordinates = toLeafletPath(parsed);
             return {
               ...area,
               path: invertedCoordinates,
@@ -48,9 +49,23 @@ const Climbs = ({ initialClimbs, initialPage }) => {
       }
     };
 
+    fetchAreas();
+    fetchHitlist();
+  }, []);
+
+  // Look up only the first ascensionists of the climbs on screen
+  useEffect(() => {
     const fetchUsers = async () => {
+      const names = [...new Set(climbs.map(climb => climb.first_ascensionist).filter(Boolean))];
+      if (names.length === 0) {
+        return;
+      }
       try {
-        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`);
+        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`, {
+          params: {
+            usernames: names.join(','),
+          },
+        });
         const usersData = response.data.reduce((acc, user) => {
           acc[user.username] = user.id;
           return acc;
@@ -61,10 +76,8 @@ const Climbs = ({ initialClimbs, initialPage }) => {
       }
     };
 
-    fetchAreas();
-    fetchHitlist();
     fetchUsers();
-  }, []);
+  }, [climbs]);
 
   const applyFilters = async (selectedGrades, selectedAreas) => {
     try {
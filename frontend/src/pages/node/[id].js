@@ -33,26 +33,26 @@ const ClimbDetail = ({ climb }) => {
       try {
         const token = localStorage.getItem('token');
 
-        const ticklistResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/ticklist/`, {
+        const membershipResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/membership`, {
+          params: {
+            climb_ids: climb.id,
+          },
           headers: {
             Authorization: `Bearer ${token}`
           }
         });
-        const ticklist = ticklistResponse.data;
-        setIsOnTicklist(ticklist.some(item => item.id === climb.id));
-
-        const hitlistResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/hitlist/`, {
-          headers: {
-            Authorization: `Bearer ${token}`
-          }
-        });
-        const hitlist = hitlistResponse.data;
-        setIsOnHitlist(hitlist.some(item => item.id === climb.id));
+        const [state] = membershipResponse.data;
+        setIsOnTicklist(Boolean(state && state.ticked));
+        setIsOnHitlist(Boolean(state && state.hitlisted));
 
         const logsResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/${id}/logs`);
         setLogs(logsResponse.data);
 
-        const usersResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`);
+        const usersResponse = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`, {
+          params: {
+            usernames: first_ascensionist || '',
+          },
+        });
         const usersData = usersResponse.data.reduce((acc, user) => {
           acc[user.username] = user.id;
           return acc;
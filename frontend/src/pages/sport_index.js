@@ -5,14 +5,17 @@ import MapFilters from '../components/map_filters';
 import styles from '../styles/climbs.module.css';
 import withAuth from '../hoc/withAuth';
 import * as wellknown from 'wellknown';
+import { toLeafletPath } from '../utils/area_path';
 
-const SportIndex = ({ initialClimbs, initialPage }) => {
+const SportIndex = ({ initialClimbs, initialPage, initialNextCursor }) => {
   const [climbs, setClimbs] = useState(initialClimbs);
   const [page, setPage] = useState(initialPage);
   const [areas, setAreas] = useState([]);
   const [hitlistClimbs, setHitlistClimbs] = useState([]);
   const [users, setUsers] = useState({});
-  const [hasMore, setHasMore] = useState(initialClimbs.length === 25);
+  // cursors[n] is the cursor that loads page n + 1; the first page needs none
+  const [cursors, setCursors] = useState([null, initialNextCursor]);
+  const [hasMore, setHasMore] = useState(Boolean(initialNextCursor));
 
   useEffect(() => {
     const fetchAreas = async () => {
@@ -22,7 +25,7 @@ const SportIndex = ({ initialClimbs, initialPage }) => {
           .filter(area => area.polygon)
           .map(area => {
             const parsed = wellknown.parse(area.polygon);
-            const invertedCoordinates = parsed.coordinates[0].map(coord => [coord[1], coord[0]]);
+            const invertedCoordinates = toLeafletPath(parsed);
             return {
               ...area,
               path: invertedCoordinates,
@@ -34,23 +37,22 @@ const SportIndex = ({ initialClimbs, initialPage }) => {
       }
     };
 
-    const fetchHitlist = async () => {
-      try {
-        const token = localStorage.getItem('token');
-        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/hitlist/`, {
-          headers: {
-            Authorization: `Bearer ${token}`
-          }
-        });
-        setHitlistClimbs(response.data.map(climb => climb.id));
-      } catch (error) {
-        console.error('Error fetching hitlist:', error);
-      }
-    };
+    fetchAreas();
+  }, []);
 
+  // Look up only the first ascensionists of the climbs on screen
+  useEffect(() => {
     const fetchUsers = async () => {
+      const names = [...new Set(climbs.map(climb => climb.first_ascensionist).filter(Boolean))];
+      if (names.length === 0) {
+        return;
+      }
       try {
-        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`);
+        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/users/`, {
+          params: {
+            usernames: names.join(','),
+          },
+        });
         const usersData = response.data.reduce((acc, user) => {
           acc[user.username] = user.id;
           return acc;
@@ -61,10 +63,33 @@ const SportIndex = ({ initialClimbs, initialPage }) => {
       }
     };
 
-    fetchAreas();
-    fetchHitlist();
     fetchUsers();
-  }, []);
+  }, [climbs]);
+
+  // Ask only about the climbs on screen instead of downloading the whole hitlist
+  useEffect(() => {
+    const fetchHitlistState = async () => {
+      if (climbs.length === 0) {
+        return;
+      }
+      try {
+        const token = localStorage.getItem('token');
+        const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/membership`, {
+          params: {
+            climb_ids: climbs.map(climb => climb.id).join(','),
+          },
+          headers: {
+            Authorization: `Bearer ${token}`
+          }
+        });
+        setHitlistClimbs(response.data.filter(state => state.hitlisted).map(state => state.climb_id));
+      } catch (error) {
+        console.error('Error fetching hitlist:', error);
+      }
+    };
+
+    fetchHitlistState();
+  }, [climbs]);
 
   const applyFilters = async (selectedGrades, selectedAreas) => {
     try {
@@ -73,13 +98,14 @@ const SportIndex = ({ initialClimbs, initialPage }) => {
           type: 'Sport',
           grades: selectedGrades.join(','),
           areas: selectedAreas.join(','),
-          skip: 0,
           limit: 25,
         }
       });
+      const nextCursor = response.headers['x-next-cursor'] || null;
       setClimbs(response.data);
       setPage(1);
-      setHasMore(response.data.length === 25);
+      setCursors([null, nextCursor]);
+      setHasMore(Boolean(nextCursor));
     } catch (error) {
       console.error('Error fetching filtered climbs:', error);
     }
@@ -114,13 +140,19 @@ const SportIndex = ({ initialClimbs, initialPage }) => {
       const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/`, {
         params: {
           type: 'Sport',
-          skip: (newPage - 1) * 25,
+          cursor: cursors[newPage - 1] || undefined,
           limit: 25,
         }
       });
+      const nextCursor = response.headers['x-next-cursor'] || null;
       setClimbs(response.data);
       setPage(newPage);
-      setHasMore(response.data.length === 25);
+      setCursors(prev => {
+        const updated = prev.slice(0, newPage);
+        updated[newPage] = nextCursor;
+        return updated;
+      });
+      setHasMore(Boolean(nextCursor));
     } catch (error) {
       console.error('Error loading page:', error);
     }
@@ -212,7 +244,6 @@ export async function getServerSideProps() {
     const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/`, {
       params: {
         type: 'Sport',
-        skip: 0,
         limit: 25,
       }
     });
@@ -220,6 +251,7 @@ export async function getServerSideProps() {
       props: {
         initialClimbs: response.data,
         initialPage: 1,
+        initialNextCursor: response.headers['x-next-cursor'] || null,
       },
     };
   } catch (error) {
@@ -228,6 +260,7 @@ export async function getServerSideProps() {
       props: {
         initialClimbs: [],
         initialPage: 1,
+        initialNextCursor: null,
       },
     };
   }
@@ -0,0 +1,21 @@
+// Convert an area geometry (Polygon or MultiPolygon, lon/lat order, from WKT or GeoJSON) into
+// Leaflet positions (lat/lng order), keeping every part and its holes.
+const toLatLngRing = ring => ring.map(coord => [coord[1], coord[0]]);
+
+export const toLeafletPath = geometry => {
+  if (geometry.type === 'MultiPolygon') {
+    return geometry.coordinates.map(polygon => polygon.map(toLatLngRing));
+  }
+  return geometry.coordinates.map(toLatLngRing);
+};
+
+// Simplification level of /areas/geojson for a map zoom, matching the backend's detail_for_zoom
+export const detailForZoom = zoom => {
+  if (zoom === undefined || zoom === null || zoom >= 14) {
+    return 'full';
+  }
+  if (zoom >= 10) {
+    return 'medium';
+  }
+  return 'coarse';
+};
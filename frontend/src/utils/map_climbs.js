@@ -0,0 +1,32 @@
+import axios from 'axios';
+
+// Below this zoom an unfiltered map shows server-side clusters instead of pins
+export const CLUSTER_ZOOM_LIMIT = 13;
+
+// Climbs for the visible part of a map: { clusters } from /climbs/clusters when
+// zoomed out without filters, otherwise { climbs } from /climbs/bbox
+export const fetchMapClimbs = async (type, viewport, grades, areas) => {
+  const bounds = {
+    min_lon: viewport.minLon,
+    min_lat: viewport.minLat,
+    max_lon: viewport.maxLon,
+    max_lat: viewport.maxLat,
+  };
+
+  if (viewport.zoom < CLUSTER_ZOOM_LIMIT && grades.length === 0 && areas.length === 0) {
+    const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/clusters`, {
+      params: { type, zoom: viewport.zoom, ...bounds },
+    });
+    return { climbs: [], clusters: response.data };
+  }
+
+  const response = await axios.get(`${process.env.NEXT_PUBLIC_API_URL}/climbs/bbox`, {
+    params: {
+      type,
+      ...bounds,
+      grades: grades.join(',') || undefined,
+      areas: areas.join(',') || undefined,
+    },
+  });
+  return { climbs: response.data, clusters: [] };
+};